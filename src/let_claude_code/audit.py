@@ -12,15 +12,84 @@ Usage:
 """
 
 import argparse
+import contextlib
+import difflib
+import hashlib
+import http.client
+import io
 import json
 import os
+import re
+import selectors
 import subprocess
 import sys
 import tempfile
-import urllib.error
-import urllib.request
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple
+from typing import Iterator, Tuple
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# API payloads and SSE events go through orjson when installed; the cache
+# files keep using json.
+if HAS_ORJSON:
+    _loads = orjson.loads
+    _dumps_bytes = orjson.dumps
+else:
+    _loads = json.loads
+
+    def _dumps_bytes(obj) -> bytes:
+        # Raw UTF-8 like orjson; \uXXXX escapes would inflate non-ASCII text up to 6x
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+# Source file extensions included when auditing a directory
+SOURCE_EXTENSIONS = frozenset({'.py', '.js', '.ts', '.tsx', '.jsx', '.java', '.go', '.rs', '.c', '.cpp', '.h'})
+
+# Directories never descended into
+SKIP_DIRS = frozenset({'.git', 'node_modules'})
+
+# Below this many files, reading sequentially beats starting a thread pool
+PARALLEL_READ_MIN_FILES = 8
+
+# Largest directory payload sent in one request (override with AUDIT_MAX_CHARS)
+DEFAULT_AUDIT_MAX_CHARS = 400_000
+
+
+def env_positive_int(name: str, default: int) -> int:
+    """Read a positive integer setting from the environment, warning and using default if invalid."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number <= 0:
+        print(f"⚠️  {name} must be a positive integer, got {value!r}; using {default}")
+        return default
+    return number
+
+
+def iter_source_files(root: Path) -> Iterator[Path]:
+    """Yield source files under root in a single sorted walk, pruning SKIP_DIRS."""
+    try:
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in SKIP_DIRS:
+                yield from iter_source_files(Path(entry.path))
+        elif os.path.splitext(entry.name)[1] in SOURCE_EXTENSIONS and entry.is_file():
+            yield Path(entry.path)
 
 
 def read_target(target_path: Path) -> str:
@@ -31,35 +100,235 @@ def read_target(target_path: Path) -> str:
         except Exception as e:
             return f"[Error reading {target_path}: {e}]"
     elif target_path.is_dir():
-        # Read all relevant files in directory
-        contents = []
-        for ext in ['.py', '.js', '.ts', '.tsx', '.jsx', '.java', '.go', '.rs', '.c', '.cpp', '.h']:
-            for file_path in target_path.rglob(f'*{ext}'):
-                if '.git' not in str(file_path) and 'node_modules' not in str(file_path):
-                    try:
-                        content = file_path.read_text()
-                        contents.append(f"=== {file_path.relative_to(target_path)} ===\n{content}\n")
-                    except Exception:
-                        pass
-        return "\n".join(contents) if contents else "[No readable files found]"
+        return format_sources(read_source_files(target_path))
     else:
         return "[Target not found]"
 
 
-def ask_gpt5(content: str, context: str, model: str = "gpt-5.2", goal: str | None = None, reasoning_effort: str = "high") -> str | None:
-    """Send content to GPT-5/GPT-4 for audit and get instructions for Claude."""
+def read_source_files(target_path: Path) -> dict[str, str]:
+    """Map each audited file's path (relative to a directory target) to its contents."""
+    if target_path.is_file():
+        try:
+            return {target_path.name: target_path.read_text()}
+        except Exception:
+            return {}
+    paths = list(iter_source_files(target_path))
+    if len(paths) < PARALLEL_READ_MIN_FILES:
+        contents = map(_read_source, paths)
+    else:
+        # Reads are I/O-bound, so threads overlap disk latency despite the GIL
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+            contents = list(pool.map(_read_source, paths))
+    return {
+        str(path.relative_to(target_path)): content
+        for path, content in zip(paths, contents)
+        if content is not None
+    }
+
+
+# Decoded source text by path, with the (st_mtime_ns, st_size) it was read at.
+# Later --until-complete iterations only re-read files Claude touched.
+_source_cache: dict[Path, tuple[int, int, str]] = {}
+
+
+def _read_source(path: Path) -> str | None:
+    try:
+        st = path.stat()
+        cached = _source_cache.get(path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        content = path.read_text(errors='replace')
+    except OSError:
+        _source_cache.pop(path, None)
+        return None
+    _source_cache[path] = (st.st_mtime_ns, st.st_size, content)
+    return content
+
+
+def format_sources(files: dict[str, str], max_chars: int | None = None) -> str:
+    """Join directory sources into the audit payload, one header per file.
+
+    Files are added in walk order until the next one would take the payload
+    past max_chars (default: AUDIT_MAX_CHARS or DEFAULT_AUDIT_MAX_CHARS); the
+    rest are left out and counted in a note at the end. A first file that is
+    larger than the budget on its own is cut and marked as truncated.
+    """
+    if not files:
+        return "[No readable files found]"
+    if max_chars is None:
+        max_chars = env_positive_int("AUDIT_MAX_CHARS", DEFAULT_AUDIT_MAX_CHARS)
+    parts = []
+    total = 0
+    truncated = None
+    for path, content in files.items():
+        part = f"=== {path} ===\n{content}\n"
+        if total + len(part) > max_chars:
+            if not parts:
+                # A single oversized file is cut rather than dropped, and says so
+                truncated = path
+                parts.append(f"{part[:max_chars]}\n[{path} truncated at {max_chars} chars]")
+            break
+        parts.append(part)
+        total += len(part) + 1
+    skipped = len(files) - len(parts)
+    if skipped or truncated:
+        cut = f"{truncated} truncated, " if truncated else ""
+        print(f"⚠️  Payload limit of {max_chars} characters reached; {cut}{skipped} file(s) not sent "
+              "(raise AUDIT_MAX_CHARS or use --parallel)")
+    if skipped:
+        parts.append(f"[{skipped} more file(s) not included: payload limit of {max_chars} characters reached]")
+    return "\n".join(parts)
+
+
+def build_delta_payload(previous: dict[str, str], current: dict[str, str],
+                        max_chars: int | None = None) -> str | None:
+    """Describe the changes between two read_source_files() snapshots as unified diffs.
+
+    A payload over max_chars (default: AUDIT_MAX_CHARS or
+    DEFAULT_AUDIT_MAX_CHARS) is cut at a line boundary and marked as
+    truncated. Returns None if nothing changed.
+    """
+    changed = sorted(path for path in previous.keys() | current.keys() if previous.get(path) != current.get(path))
+    if not changed:
+        return None
+    parts = ["## Changed files (unified diff against the previous iteration)"]
+    for path in changed:
+        parts.extend(difflib.unified_diff(
+            previous.get(path, "").splitlines(), current.get(path, "").splitlines(),
+            fromfile=f"a/{path}", tofile=f"b/{path}", lineterm="",
+        ))
+    unchanged = [path for path in current if previous.get(path) == current[path]]
+    if unchanged:
+        parts.append("\n## Unchanged files\n" + "\n".join(unchanged))
+    payload = "\n".join(parts)
+    if max_chars is None:
+        max_chars = env_positive_int("AUDIT_MAX_CHARS", DEFAULT_AUDIT_MAX_CHARS)
+    if len(payload) > max_chars:
+        print(f"⚠️  Payload limit of {max_chars} characters reached; diff truncated "
+              "(raise AUDIT_MAX_CHARS or use --parallel)")
+        cut = payload.rfind("\n", 0, max_chars)
+        payload = f"{payload[:cut if cut > 0 else max_chars]}\n[diff truncated at {max_chars} chars]"
+    return payload
+
+
+# Header lines of the audit response format (see build_audit_prompt)
+_HEADER_RE = re.compile(r'^[ \t]*(ISSUES_FOUND|CONTINUE|INSTRUCTIONS_FOR_CLAUDE):(.*)$', re.MULTILINE)
+
+# A NO verdict on its own line; either one means the instructions that follow are unused
+_VERDICT_NO_RE = re.compile(r'^\s*(?:ISSUES_FOUND|CONTINUE):\s*NO[ \t]*\n', re.MULTILINE)
+
+# The verdict lines open the response; stop looking for them after this many characters
+VERDICT_WINDOW = 1000
+
+# Lines of Claude's output kept as the run summary
+SUMMARY_TAIL_LINES = 100
+
+# Audit responses are cached here, keyed by a hash of the model, reasoning
+# effort and exact prompt, so re-auditing unchanged code skips the API call
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "let_claude_code" / "audit"
+CACHE_TTL_SECONDS = 24 * 3600
+
+# Concurrent per-file requests with --parallel (override with AUDIT_CONCURRENCY)
+DEFAULT_AUDIT_CONCURRENCY = 4
+
+
+def audit_cache_key(model: str, reasoning_effort: str, prompt: str) -> str:
+    """Return the cache key for an audit request."""
+    return hashlib.sha256(f"{model}\0{reasoning_effort}\0{prompt}".encode()).hexdigest()
+
+
+def load_cached_audit(key: str):
+    """Return a cached audit response younger than CACHE_TTL_SECONDS, or None."""
+    path = CACHE_DIR / f"{key}.json"
+    try:
+        if time.time() - path.stat().st_mtime > CACHE_TTL_SECONDS:
+            return None
+        return json.loads(path.read_text())["output"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_cached_audit(key: str, output) -> None:
+    """Store an audit response, writing atomically so readers never see a partial file."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=CACHE_DIR, suffix=".tmp", delete=False) as f:
+            json.dump({"output": output}, f)
+        os.replace(f.name, CACHE_DIR / f"{key}.json")
+    except OSError as e:
+        print(f"Warning: could not write audit cache: {e}")
+
+
+def ask_gpt5(content: str, context: str, model: str = "gpt-5.2", goal: str | None = None,
+             reasoning_effort: str = "high", use_cache: bool = True, quiet: bool = False) -> str | None:
+    """Send content to GPT-5/GPT-4 for audit and get instructions for Claude.
+
+    Unless use_cache is False, an identical request made within
+    CACHE_TTL_SECONDS is answered from the on-disk cache. quiet suppresses
+    the live echo of the streamed response and the progress messages.
+    """
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
         print("Error: OPENAI_API_KEY environment variable not set")
         return None
 
-    try:
-        # Add goal-specific instructions if provided
-        goal_instruction = ""
-        if goal:
-            goal_instruction = f"\n**AUDIT FOCUS**: {goal}\nPrioritize finding issues related to this goal.\n"
+    prompt = build_audit_prompt(content, context, goal)
+    key = audit_cache_key(model, reasoning_effort, prompt)
+    if use_cache:
+        cached = load_cached_audit(key)
+        if cached is not None:
+            if not quiet:
+                print(f"♻️  Using cached {model} audit (code unchanged)")
+            return cached
+
+    output = request_audit(prompt, model, reasoning_effort, api_key, quiet=quiet)
+    if output:
+        save_cached_audit(key, output)
+    return output
+
 
-        prompt = f"""You are a code auditor working with Claude Code (an AI coding assistant).
+def audit_files_parallel(files: dict[str, str], context: str, model: str, goal: str | None,
+                         reasoning_effort: str, use_cache: bool = True,
+                         max_workers: int = DEFAULT_AUDIT_CONCURRENCY) -> dict[str, str]:
+    """Audit each file in its own request, max_workers at a time.
+
+    Returns the responses by path; files whose request failed are left out.
+    """
+    def audit_one(path: str) -> str | None:
+        return ask_gpt5(format_sources({path: files[path]}), context, model, goal, reasoning_effort,
+                        use_cache=use_cache, quiet=True)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        responses = dict(zip(files, pool.map(audit_one, files)))
+    for path, response in responses.items():
+        print(f"  {'✗ failed' if response is None else '✓'} {path}")
+    return {path: response for path, response in responses.items() if response is not None}
+
+
+def merge_audit_responses(responses: dict[str, str]) -> str:
+    """Combine per-file audit responses into one response in the standard format."""
+    issues_found = should_continue = False
+    sections = []
+    for path, response in responses.items():
+        issues, cont, instructions = parse_audit_response(response)
+        issues_found = issues_found or issues
+        if issues and cont and instructions:
+            should_continue = True
+            sections.append(f"### {path}\n{instructions}")
+    lines = [f"ISSUES_FOUND: {'YES' if issues_found else 'NO'}", f"CONTINUE: {'YES' if should_continue else 'NO'}"]
+    if sections:
+        lines += ["", "INSTRUCTIONS_FOR_CLAUDE:", "\n\n".join(sections)]
+    return "\n".join(lines)
+
+
+def build_audit_prompt(content: str, context: str, goal: str | None = None) -> str:
+    """Build the auditor prompt for the given code and iteration context."""
+    # Add goal-specific instructions if provided
+    goal_instruction = ""
+    if goal:
+        goal_instruction = f"\n**AUDIT FOCUS**: {goal}\nPrioritize finding issues related to this goal.\n"
+
+    return f"""You are a code auditor working with Claude Code (an AI coding assistant).
 
 Your job is to:
 1. Review the code below
@@ -86,11 +355,144 @@ If CONTINUE is NO or ISSUES_FOUND is NO, write "N/A")
 Be specific and direct. Claude will execute these instructions.
 """
 
+
+_OPENAI_HOST = "api.openai.com"
+_SSE_DATA_PREFIX = b"data: "
+
+# Bytes requested per read of a streaming response
+SSE_READ_SIZE = 64 * 1024
+
+# Streamed text is echoed to stdout in batches of this many characters or seconds
+ECHO_FLUSH_CHARS = 256
+ECHO_FLUSH_INTERVAL = 0.05
+_openai_conn: http.client.HTTPSConnection | None = None  # Kept alive between audit iterations
+_openai_lock = threading.Lock()  # Guards _openai_conn when --parallel audits run concurrently
+
+
+def _server_closed(conn: http.client.HTTPSConnection) -> bool:
+    """Whether the server has closed an idle kept-alive connection (its socket reads EOF)."""
+    if conn.sock is None:
+        return True
+    with selectors.DefaultSelector() as selector:
+        selector.register(conn.sock, selectors.EVENT_READ)
+        return bool(selector.select(0))
+
+
+@contextlib.contextmanager
+def _openai_post(path: str, body: bytes, headers: dict[str, str], timeout: float) -> Iterator[http.client.HTTPResponse]:
+    """POST to the OpenAI API over a reused keep-alive connection and yield the response.
+
+    The connection is kept for the next call only if the response was read to
+    the end; otherwise unread bytes would corrupt the next exchange, so it is
+    closed instead.
+
+    Only a request that failed while being written on a reused connection is
+    sent again. Once it has gone out, the server may already be running the
+    (paid) audit, so errors while waiting for the response are raised.
+    """
+    global _openai_conn
+    with _openai_lock:
+        conn, _openai_conn = _openai_conn, None
+    if conn is not None and _server_closed(conn):
+        conn.close()
+        conn = None
+    reused = conn is not None
+    if conn is None:
+        conn = http.client.HTTPSConnection(_OPENAI_HOST, timeout=timeout)
+    else:
+        conn.timeout = timeout
+        conn.sock.settimeout(timeout)
+    try:
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+        except (http.client.HTTPException, OSError):
+            if not reused:
+                raise
+            # The kept-alive connection died before the request went out; retry on a fresh one
+            conn.close()
+            conn = http.client.HTTPSConnection(_OPENAI_HOST, timeout=timeout)
+            conn.request("POST", path, body=body, headers=headers)
+        response = conn.getresponse()
+        yield response
+    except BaseException:
+        conn.close()
+        raise
+    if response.isclosed() and not response.will_close:
+        with _openai_lock:
+            if _openai_conn is None:
+                _openai_conn, conn = conn, None
+    if conn is not None:
+        conn.close()
+
+
+class StreamEcho:
+    """Echo streamed text to stdout without a write() and flush() per token.
+
+    Text is held until ECHO_FLUSH_CHARS characters are pending or
+    flush_interval seconds have passed since the last flush. Call flush()
+    before printing anything else and when the stream ends. A disabled echo
+    discards the text (used when several audits stream at once).
+    """
+
+    def __init__(self, flush_interval: float = ECHO_FLUSH_INTERVAL, enabled: bool = True) -> None:
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self._pending: list[str] = []
+        self._pending_chars = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, text: str) -> None:
+        if not self.enabled:
+            return
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        if (self._pending_chars >= ECHO_FLUSH_CHARS
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            sys.stdout.write("".join(self._pending))
+            sys.stdout.flush()
+            self._pending.clear()
+            self._pending_chars = 0
+        self._last_flush = time.monotonic()
+
+
+def iter_response_lines(response: http.client.HTTPResponse) -> Iterator[bytes]:
+    """Yield the lines of a streaming response, newline included.
+
+    Iterating an HTTPResponse directly costs a peek() and read() through the
+    chunked-encoding layer for every line. Here each read1() takes whatever
+    the current chunk holds (up to SSE_READ_SIZE) and the lines are split
+    out of a local buffer.
+    """
+    buf = bytearray()
+    while chunk := response.read1(SSE_READ_SIZE):
+        buf += chunk
+        start = 0
+        while (end := buf.find(b"\n", start)) != -1:
+            yield bytes(buf[start:end + 1])
+            start = end + 1
+        del buf[:start]
+    if buf:
+        yield bytes(buf)
+
+
+def request_audit(prompt: str, model: str, reasoning_effort: str, api_key: str,
+                  quiet: bool = False) -> str | None:
+    """Send an audit prompt to the OpenAI API and return the response text.
+
+    With quiet=True neither the streamed response text nor the progress
+    messages are printed, so concurrent audits don't interleave on stdout;
+    errors are still reported.
+    """
+    try:
         # Use Responses API for GPT-5 models, Chat Completions for GPT-4
         is_gpt5 = model.startswith("gpt-5")
 
         if is_gpt5:
-            url = "https://api.openai.com/v1/responses"
+            path = "/v1/responses"
             data = {
                 "model": model,
                 "input": prompt,
@@ -105,7 +507,7 @@ Be specific and direct. Claude will execute these instructions.
             }
         else:
             # GPT-4 models use Chat Completions API
-            url = "https://api.openai.com/v1/chat/completions"
+            path = "/v1/chat/completions"
             data = {
                 "model": model,
                 "messages": [
@@ -115,114 +517,135 @@ Be specific and direct. Claude will execute these instructions.
                 "max_tokens": 4096
             }
 
-        data_str = json.dumps(data).encode('utf-8')
+        data_str = _dumps_bytes(data)
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        }
 
-        req = urllib.request.Request(
-            url,
-            data=data_str,
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}"
-            },
-            method="POST"
-        )
-
-        print(f"🔍 Sending to {model} for audit...")
+        if not quiet:
+            print(f"🔍 Sending to {model} for audit...")
 
         # GPT-5 models can take longer, especially with high reasoning effort on large files
         # With streaming, we get chunks as they arrive, but initial reasoning can take time
         # 15 minutes should be enough even for very large files with high reasoning
         timeout = 900 if is_gpt5 else 120
 
-        with urllib.request.urlopen(req, timeout=timeout) as response:
+        with _openai_post(path, data_str, headers, timeout) as response:
+            if response.status != 200:
+                error_body = response.read().decode('utf-8', errors='replace')
+                print(f"HTTP {response.status} error: {error_body[:500]}")
+                return None
+
             if is_gpt5 and data.get("stream"):
                 # Handle streaming response (Server-Sent Events)
-                output_chunks = []
-                print("💭 Streaming response:\n", flush=True)
+                output = io.StringIO()  # Streamed text so far
+                watch_verdict = True
+                if not quiet:
+                    print("💭 Streaming response:\n", flush=True)
                 debug = os.environ.get("AUDIT_DEBUG") == "1"
-
-                for line in response:
-                    line = line.decode('utf-8').strip()
-
-                    if debug and line:
-                        print(f"\n[DEBUG] Line: {line[:200]}", flush=True)
-
-                    # SSE format: "data: {...}"
-                    if line.startswith('data: '):
-                        data_str = line[6:]  # Remove "data: " prefix
-
-                        if data_str == '[DONE]':
-                            break
-
-                        try:
-                            chunk_data = json.loads(data_str)
-                            chunk_type = chunk_data.get("type", "")
-
-                            if debug:
-                                print(f"[DEBUG] Type: {chunk_type}", flush=True)
-
-                            # Track reasoning progress
-                            if chunk_type == "response.output_item.added":
-                                item = chunk_data.get("item", {})
-                                if item.get("type") == "reasoning":
-                                    print("🧠 GPT-5.2 is reasoning (this may take several minutes for large files)...", flush=True)
-
-                            # Collect output deltas (GPT-5 Responses API format)
-                            if chunk_type == "response.output_text.delta":
-                                delta = chunk_data.get("delta", "")
-                                if delta:
-                                    output_chunks.append(delta)
-                                    print(delta, end="", flush=True)  # Print content in real-time
-
-                            # Legacy format
-                            elif chunk_type == "response.output.delta":
-                                delta = chunk_data.get("delta", "")
-                                if delta:
-                                    output_chunks.append(delta)
-                                    print(delta, end="", flush=True)
-
-                            # Also try content_block.delta for text
-                            elif chunk_type == "content_block.delta":
-                                delta_obj = chunk_data.get("delta", {})
-                                text = delta_obj.get("text", "")
-                                if text:
-                                    output_chunks.append(text)
-                                    print(text, end="", flush=True)
-
-                            # Final response
-                            elif chunk_type == "response.done":
-                                response_obj = chunk_data.get("response", {})
-                                if response_obj.get("output"):
-                                    # Prefer complete output from response.done
-                                    print("\n\n✓ Stream complete", flush=True)
-                                    return response_obj["output"]
-
-                            # Message delta (another possible format)
-                            elif chunk_type == "message.delta":
-                                delta_obj = chunk_data.get("delta", {})
-                                if delta_obj.get("content"):
-                                    for content_item in delta_obj["content"]:
-                                        if content_item.get("text"):
-                                            text = content_item["text"]
-                                            output_chunks.append(text)
-                                            print(text, end="", flush=True)
-
-                        except json.JSONDecodeError as e:
-                            if debug:
-                                print(f"\n[DEBUG] JSON error: {e}", flush=True)
-                            continue
+                # In debug mode deltas are interleaved with [DEBUG] lines, so echo them at once
+                echo = StreamEcho(0 if debug else ECHO_FLUSH_INTERVAL, enabled=not quiet)
+
+                # Lines stay bytes: blank keep-alives and event: lines are skipped
+                # without decoding, and _loads takes the data payload as is
+                try:
+                    for line in iter_response_lines(response):
+                        if debug and line.strip():
+                            print(f"\n[DEBUG] Line: {line[:200].decode('utf-8', errors='replace').strip()}", flush=True)
+
+                        # SSE format: "data: {...}"
+                        if line.startswith(_SSE_DATA_PREFIX):
+                            data_str = line[len(_SSE_DATA_PREFIX):].strip()
+
+                            if data_str == b'[DONE]':
+                                response.read()  # Drain the stream end so the connection can be reused
+                                break
+
+                            try:
+                                chunk_data = _loads(data_str)
+                                chunk_type = chunk_data.get("type", "")
+
+                                if debug:
+                                    print(f"[DEBUG] Type: {chunk_type}", flush=True)
+
+                                # Track reasoning progress
+                                if chunk_type == "response.output_item.added":
+                                    item = chunk_data.get("item", {})
+                                    if item.get("type") == "reasoning" and not quiet:
+                                        print("🧠 GPT-5.2 is reasoning (this may take several minutes for large files)...", flush=True)
+
+                                # Collect output deltas (GPT-5 Responses API format)
+                                if chunk_type == "response.output_text.delta":
+                                    delta = chunk_data.get("delta", "")
+                                    if delta:
+                                        output.write(delta)
+                                        echo.write(delta)
+
+                                # Legacy format
+                                elif chunk_type == "response.output.delta":
+                                    delta = chunk_data.get("delta", "")
+                                    if delta:
+                                        output.write(delta)
+                                        echo.write(delta)
+
+                                # Also try content_block.delta for text
+                                elif chunk_type == "content_block.delta":
+                                    delta_obj = chunk_data.get("delta", {})
+                                    text = delta_obj.get("text", "")
+                                    if text:
+                                        output.write(text)
+                                        echo.write(text)
+
+                                # Final response
+                                elif chunk_type == "response.done":
+                                    response_obj = chunk_data.get("response", {})
+                                    if response_obj.get("output"):
+                                        # Prefer complete output from response.done
+                                        echo.flush()
+                                        if not quiet:
+                                            print("\n\n✓ Stream complete", flush=True)
+                                        return response_obj["output"]
+
+                                # Message delta (another possible format)
+                                elif chunk_type == "message.delta":
+                                    delta_obj = chunk_data.get("delta", {})
+                                    if delta_obj.get("content"):
+                                        for content_item in delta_obj["content"]:
+                                            if content_item.get("text"):
+                                                text = content_item["text"]
+                                                output.write(text)
+                                                echo.write(text)
+
+                                # Stop streaming once a NO verdict makes the rest irrelevant
+                                if watch_verdict and output.tell():
+                                    head = output.getvalue()
+                                    if _VERDICT_NO_RE.search(head):
+                                        echo.flush()
+                                        if not quiet:
+                                            print("\n\n✓ Verdict received, closing stream early", flush=True)
+                                        return head
+                                    watch_verdict = len(head) < VERDICT_WINDOW
+
+                            except json.JSONDecodeError as e:
+                                if debug:
+                                    print(f"\n[DEBUG] JSON error: {e}", flush=True)
+                                continue
+                finally:
+                    echo.flush()
 
                 # Fallback to assembled chunks
-                if output_chunks:
-                    print("\n\n✓ Stream complete", flush=True)
-                    return "".join(output_chunks)
+                if output.tell():
+                    if not quiet:
+                        print("\n\n✓ Stream complete", flush=True)
+                    return output.getvalue()
 
                 print("\n⚠️  No output in stream", flush=True)
                 print("💡 Try: AUDIT_DEBUG=1 audit ... to see what's being received", flush=True)
                 return None
             else:
                 # Non-streaming response (GPT-4 or non-stream GPT-5)
-                result = json.loads(response.read().decode('utf-8'))
+                result = _loads(response.read())
 
                 if is_gpt5:
                     if result.get("output"):
@@ -235,12 +658,8 @@ Be specific and direct. Claude will execute these instructions.
                 print(f"Error: No output from {model}")
                 return None
 
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode('utf-8') if e.fp else ""
-        print(f"HTTP {e.code} error: {error_body[:500]}")
-        return None
-    except urllib.error.URLError as e:
-        print(f"URL error: {e.reason}")
+    except (http.client.HTTPException, OSError) as e:
+        print(f"Connection error: {type(e).__name__}: {e}")
         return None
     except Exception as e:
         print(f"Error: {type(e).__name__}: {e}")
@@ -255,45 +674,45 @@ def run_claude_with_instructions(instructions: str, project_dir: Path) -> Tuple[
     print(instructions)
     print(f"{'='*60}\n")
 
-    # Write instructions to temp file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-        f.write(instructions)
-        temp_file = f.name
-
+    # Feed the instructions on stdin; no shell or temp file needed. stderr goes
+    # straight to our terminal: it is shown as it happens without a trip
+    # through this process, and stays out of the stdout summary.
     try:
-        # Run claude with the instructions
-        cmd = ["bash", "-c", f"claude --print < '{temp_file}'"]
-
         process = subprocess.Popen(
-            cmd,
+            ["claude", "--print"],
             cwd=project_dir,
+            stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
             text=True,
         )
+    except FileNotFoundError:
+        return False, "Claude CLI not found"
 
-        output_lines = []
-        while True:
-            line = process.stdout.readline()
-            if not line:
-                if process.poll() is not None:
-                    break
-                continue
+    # Tee output from a reader thread so a large prompt can't deadlock against
+    # a full stdout pipe, and keep only the tail for the summary
+    tail: deque[str] = deque(maxlen=SUMMARY_TAIL_LINES)
 
+    def pump() -> None:
+        for line in process.stdout:
             print(line, end="", flush=True)
-            output_lines.append(line)
+            tail.append(line)
 
-        success = process.returncode == 0
-        summary = "".join(output_lines[-100:]) if output_lines else ""
+    reader = threading.Thread(target=pump, name="claude-output", daemon=True)
+    reader.start()
 
-        return success, summary
+    try:
+        process.stdin.write(instructions)
+        process.stdin.close()
+    except BrokenPipeError:
+        pass  # Claude exited early; its output and exit code tell us why
 
-    finally:
-        # Clean up temp file
-        try:
-            os.unlink(temp_file)
-        except OSError:
-            pass
+    process.wait()
+    reader.join()
+
+    success = process.returncode == 0
+    summary = "".join(tail)
+
+    return success, summary
 
 
 def parse_audit_response(response: str) -> Tuple[bool, bool, str]:
@@ -305,32 +724,35 @@ def parse_audit_response(response: str) -> Tuple[bool, bool, str]:
     issues_found = False
     should_continue = False
     instructions = None
-
-    lines = response.split('\n')
-    in_instructions_section = False
     instruction_lines = []
+    section_start = None  # Offset of the open INSTRUCTIONS_FOR_CLAUDE body, if any
 
-    for line in lines:
-        line_stripped = line.strip()
-
-        if line_stripped.startswith('ISSUES_FOUND:'):
-            value = line_stripped.split(':', 1)[1].strip().upper()
-            issues_found = 'YES' in value
-            in_instructions_section = False
-        elif line_stripped.startswith('CONTINUE:'):
-            value = line_stripped.split(':', 1)[1].strip().upper()
-            should_continue = 'YES' in value
-            in_instructions_section = False
-        elif line_stripped.startswith('INSTRUCTIONS_FOR_CLAUDE:'):
-            in_instructions_section = True
-            # Check if instructions on same line
-            rest = line_stripped.split(':', 1)[1].strip()
-            if rest and rest.upper() != 'N/A':
-                instruction_lines.append(rest)
-        elif in_instructions_section:
+    def close_section(end: int) -> None:
+        for line in response[section_start:end].split('\n'):
+            line_stripped = line.strip()
             if line_stripped and line_stripped.upper() != 'N/A':
                 instruction_lines.append(line)
 
+    for match in _HEADER_RE.finditer(response):
+        # Any header ends the instructions body that precedes it
+        if section_start is not None:
+            close_section(match.start())
+            section_start = None
+
+        key, value = match.group(1), match.group(2).strip()
+        if key == 'ISSUES_FOUND':
+            issues_found = 'YES' in value.upper()
+        elif key == 'CONTINUE':
+            should_continue = 'YES' in value.upper()
+        else:
+            # Instructions may start on the header line itself
+            if value and value.upper() != 'N/A':
+                instruction_lines.append(value)
+            section_start = match.end() + 1
+
+    if section_start is not None:
+        close_section(len(response))
+
     if instruction_lines:
         instructions = '\n'.join(instruction_lines).strip()
         if instructions.upper() == 'N/A':
@@ -353,8 +775,15 @@ def main():
                        help="GPT-5 reasoning effort (default: high). Use 'medium' or 'low' for faster responses.")
     parser.add_argument("--max-iterations", type=int, default=10,
                        help="Maximum iterations when using --until-complete (default: 10)")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Always query the model instead of reusing a cached audit of unchanged code "
+                            "(also set by AUDIT_NO_CACHE=1)")
+    parser.add_argument("--parallel", action="store_true",
+                       help="Audit each file of a directory in its own request, several at once "
+                            f"(AUDIT_CONCURRENCY, default {DEFAULT_AUDIT_CONCURRENCY})")
 
     args = parser.parse_args()
+    args.no_cache = args.no_cache or os.environ.get("AUDIT_NO_CACHE") == "1"
 
     # Validate target exists
     target_path = Path(args.target).resolve()
@@ -381,6 +810,11 @@ def main():
 
     iteration = 0
     max_iterations = args.max_iterations if args.until_complete else 1
+    previous_files = None  # Snapshot the last audit saw, for sending only the changes
+    instructions = None
+    claude_succeeded = False  # Whether the last Claude run completed
+    parallel = args.parallel and target_path.is_dir()
+    clean_files: dict[str, str] = {}  # --parallel: files whose last audit found nothing, by content
 
     while iteration < max_iterations:
         iteration += 1
@@ -389,11 +823,47 @@ def main():
         print(f"{'#'*60}\n")
 
         # Read current state of target
-        content = read_target(target_path)
+        files = read_source_files(target_path)
+        if files and files == previous_files and claude_succeeded:
+            # Claude finished without edits, so the auditor would see the same code again.
+            # After a failed run the full code is audited again instead (there is no delta).
+            print("No file changes detected since last iteration, stopping.")
+            break
+        if parallel:
+            # Re-audit only files that changed or still had issues last time
+            pending = {path: text for path, text in files.items() if clean_files.get(path) != text}
+            print(f"🔍 Auditing {len(pending)} of {len(files)} files in parallel...")
+            responses = audit_files_parallel(
+                pending, f"This is iteration {iteration}. Previous iterations may have made changes.",
+                args.ai_model, args.goal, args.reasoning, use_cache=not args.no_cache,
+                max_workers=env_positive_int("AUDIT_CONCURRENCY", DEFAULT_AUDIT_CONCURRENCY),
+            )
+            for path, response in responses.items():
+                if parse_audit_response(response)[0]:
+                    clean_files.pop(path, None)
+                else:
+                    clean_files[path] = files[path]
+            audit_response = merge_audit_responses(responses) if responses or not pending else None
+        else:
+            # After the first audit, send only what changed
+            delta = build_delta_payload(previous_files, files) if previous_files is not None else None
+            if delta and len(delta) < sum(map(len, files.values())):
+                content = delta
+                context = (
+                    f"This is iteration {iteration}. The code below is not the full codebase: it is a "
+                    "unified diff of the changes Claude made after the previous audit, followed by the names of "
+                    "the files that did not change since then. Their content is not included; earlier iterations "
+                    "sent some of them in full or as diffs, but files over the payload limit may never have been sent. "
+                    f"The previous instructions were:\n{instructions}"
+                )
+            else:
+                content = format_sources(files) if target_path.is_dir() else read_target(target_path)
+                context = f"This is iteration {iteration}. Previous iterations may have made changes."
 
-        # Send to GPT-5.2 for audit
-        context = f"This is iteration {iteration}. Previous iterations may have made changes."
-        audit_response = ask_gpt5(content, context, args.ai_model, args.goal, args.reasoning)
+            # Send to GPT-5.2 for audit
+            audit_response = ask_gpt5(content, context, args.ai_model, args.goal, args.reasoning,
+                                      use_cache=not args.no_cache)
+        previous_files = files
 
         if not audit_response:
             print("❌ Failed to get audit response from GPT-5.2")
@@ -422,6 +892,7 @@ def main():
 
         # Run Claude with instructions
         success, summary = run_claude_with_instructions(instructions, project_dir)
+        claude_succeeded = success
 
         if not success:
             print("❌ Claude Code failed to execute instructions")
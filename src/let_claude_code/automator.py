@@ -14,20 +14,34 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import fcntl
+import asyncio
+import atexit
+import contextlib
+import functools
+import hashlib
+import http.client
 import json
+import math
 import os
-import random
 import re
-import string
+import secrets
+import selectors
+import shlex
+import signal
+import socket
+import ssl
 import subprocess
 import sys
+import threading
 import time
 import urllib.parse
-import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import IO
+from types import MappingProxyType
+from typing import Callable, Mapping, Sequence
 
 try:
     from croniter import croniter
@@ -35,6 +49,24 @@ try:
 except ImportError:
     HAS_CRONITER = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Machine-generated JSON (Claude stream events, API payloads) goes through
+# orjson when installed; config and session files keep using json.
+if HAS_ORJSON:
+    _loads = orjson.loads
+    _dumps_bytes = orjson.dumps
+else:
+    _loads = json.loads
+
+    def _dumps_bytes(obj) -> bytes:
+        # Raw UTF-8 like orjson; \uXXXX escapes would inflate non-ASCII text up to 6x
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 # ============================================================================
 # IMPROVEMENT MODES - Predefined prompts for each mode
 # ============================================================================
@@ -296,6 +328,31 @@ Limit: Focus on the most impactful accessibility issues. Check at most 5 files."
     },
 }
 
+
+@dataclass(frozen=True, slots=True)
+class ModeSpec:
+    """An improvement mode with its prompt fragments rendered once at import."""
+    key: str
+    name: str
+    description: str
+    prompt: str
+    section: str  # "## Name" heading plus prompt, used by combined prompts
+    branch_prefix: str  # Branch name prefix, e.g. "fix-bugs"
+
+
+# Read-only so nothing can mutate the registry (or stale cached prompts) at runtime
+MODES: Mapping[str, ModeSpec] = MappingProxyType({
+    key: ModeSpec(
+        key=key,
+        name=mode["name"],
+        description=mode["description"],
+        prompt=mode["prompt"],
+        section=f"## {mode['name']}\n\n{mode['prompt']}",
+        branch_prefix=key.replace("_", "-"),
+    )
+    for key, mode in IMPROVEMENT_MODES.items()
+})
+
 # ============================================================================
 # NORTHSTAR TEMPLATE - Default template for NORTHSTAR.md
 # ============================================================================
@@ -449,21 +506,12 @@ If the goal is already fully achieved, say "Goal achieved!" and summarize what w
 """
 
 
-def get_northstar_prompt(northstar_content: str) -> str:
-    """Generate a prompt for Claude to work towards North Star goals.
-
-    Args:
-        northstar_content: The contents of the NORTHSTAR.md file defining project vision and goals.
-
-    Returns:
-        A formatted prompt instructing Claude to analyze the codebase and make
-        incremental progress towards the defined goals.
-    """
-    return f"""You are working towards the project's North Star vision. Read the goals below and make progress towards them.
+# Static scaffold for get_northstar_prompt; only {content} varies per call.
+_NORTHSTAR_PROMPT_TEMPLATE = """You are working towards the project's North Star vision. Read the goals below and make progress towards them.
 
 ## NORTHSTAR.md - Project Vision & Goals
 
-{northstar_content}
+{content}
 
 ---
 
@@ -507,6 +555,19 @@ If the North Star goals are already fully achieved, say "North Star achieved! Al
 """
 
 
+def get_northstar_prompt(northstar_content: str) -> str:
+    """Generate a prompt for Claude to work towards North Star goals.
+
+    Args:
+        northstar_content: The contents of the NORTHSTAR.md file defining project vision and goals.
+
+    Returns:
+        A formatted prompt instructing Claude to analyze the codebase and make
+        incremental progress towards the defined goals.
+    """
+    return _NORTHSTAR_PROMPT_TEMPLATE.format(content=northstar_content)
+
+
 def get_pr_review_prompt(pr_number: str) -> str:
     """Generate a prompt for Claude to review a pull request.
 
@@ -578,21 +639,23 @@ def get_combined_prompt(mode_keys: list[str]) -> str:
     """Generate a combined prompt for multiple improvement modes.
 
     Args:
-        mode_keys: List of mode keys from IMPROVEMENT_MODES (e.g., ['fix_bugs', 'security']).
+        mode_keys: List of mode keys from MODES (e.g., ['fix_bugs', 'security']).
 
     Returns:
         For a single mode, returns that mode's prompt directly.
         For multiple modes, returns a combined prompt with all mode instructions
         separated by dividers and guidance for systematic execution.
     """
+    return _build_combined_prompt(tuple(mode_keys))
+
+
+@functools.lru_cache(maxsize=64)
+def _build_combined_prompt(mode_keys: tuple[str, ...]) -> str:
+    """Assemble the combined prompt; cached since MODES never changes at runtime."""
     if len(mode_keys) == 1:
-        return IMPROVEMENT_MODES[mode_keys[0]]["prompt"]
+        return MODES[mode_keys[0]].prompt
 
-    prompts = []
-    for key in mode_keys:
-        if key in IMPROVEMENT_MODES:
-            mode = IMPROVEMENT_MODES[key]
-            prompts.append(f"## {mode['name']}\n\n{mode['prompt']}")
+    prompts = [MODES[key].section for key in mode_keys if key in MODES]
 
     return """You will perform multiple types of code improvements. Complete each section in order.
 
@@ -603,6 +666,11 @@ def get_combined_prompt(mode_keys: list[str]) -> str:
 IMPORTANT: Work through each section systematically. Make atomic commits for each improvement with appropriate prefixes (fix:, refactor:, ux:, test:, docs:, security:, perf:, cleanup:, modernize:, a11y:).
 """
 
+
+def iter_mode_prompts(mode_keys: Sequence[str]) -> list[tuple[str, str]]:
+    """Return (name, prompt) for each known mode, for running modes one at a time."""
+    return [(MODES[key].name, MODES[key].prompt) for key in mode_keys if key in MODES]
+
 # ============================================================================
 # INPUT VALIDATION
 # ============================================================================
@@ -812,14 +880,18 @@ def configure_claude_permissions(project_dir: Path, user_level: bool = False) ->
 # HELPER FUNCTIONS
 # ============================================================================
 
+# MODES is immutable, so the help listing is built once at import
+_MODE_LIST = "\n".join([
+    "\nAvailable improvement modes:\n",
+    *(f"  {key:20} - {spec.description}" for key, spec in MODES.items()),
+    f"\n  {'all':20} - Run all improvement modes sequentially",
+    f"  {'interactive':20} - Interactively select modes to run",
+    f"\n  {'northstar':20} - Iterate towards goals defined in NORTHSTAR.md",
+])
+
+
 def get_mode_list() -> str:
-    lines = ["\nAvailable improvement modes:\n"]
-    for key, mode in IMPROVEMENT_MODES.items():
-        lines.append(f"  {key:20} - {mode['description']}")
-    lines.append(f"\n  {'all':20} - Run all improvement modes sequentially")
-    lines.append(f"  {'interactive':20} - Interactively select modes to run")
-    lines.append(f"\n  {'northstar':20} - Iterate towards goals defined in NORTHSTAR.md")
-    return "\n".join(lines)
+    return _MODE_LIST
 
 
 def create_default_northstar(project_dir: Path) -> tuple[bool, str]:
@@ -833,32 +905,50 @@ def create_default_northstar(project_dir: Path) -> tuple[bool, str]:
         return False, f"Failed to create NORTHSTAR.md: {e}"
 
 
+# Rendered NORTHSTAR prompts keyed by path and validated against (mtime_ns, size),
+# so daemon iterations skip the read and format while the file is unchanged.
+_northstar_cache: dict[Path, tuple[int, int, str]] = {}
+_northstar_lock = threading.Lock()
+
+
 def load_northstar_prompt(project_dir: Path) -> tuple[str | None, str | None]:
     northstar_path = project_dir / "NORTHSTAR.md"
-    if not northstar_path.exists():
+    try:
+        st = northstar_path.stat()
+    except FileNotFoundError:
         return None, f"NORTHSTAR.md not found in {project_dir}"
+    except OSError as e:
+        return None, f"Failed to read NORTHSTAR.md: {e}"
+
+    with _northstar_lock:
+        cached = _northstar_cache.get(northstar_path)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2], None
+
     try:
         content = northstar_path.read_text()
     except Exception as e:
         return None, f"Failed to read NORTHSTAR.md: {e}"
     if not content.strip():
         return None, "NORTHSTAR.md is empty"
-    return get_northstar_prompt(content), None
-
 
-def select_modes_interactive() -> list[str]:
-    print("\n" + "=" * 60)
-    print("Select improvement modes to run")
-    print("=" * 60 + "\n")
+    prompt = get_northstar_prompt(content)
+    with _northstar_lock:
+        _northstar_cache[northstar_path] = (st.st_mtime_ns, st.st_size, prompt)
+    return prompt, None
 
-    modes = list(IMPROVEMENT_MODES.keys())
-    for i, key in enumerate(modes, 1):
-        mode = IMPROVEMENT_MODES[key]
-        print(f"  [{i:2}] {mode['name']:25} - {mode['description']}")
 
-    print("\n  [ 0] All modes")
-    print("  [ q] Quit")
-    print("\nEnter mode numbers separated by space (e.g., '1 3 5'), or '0' for all:")
+def select_modes_interactive() -> list[str]:
+    modes = list(MODES)
+    print("\n".join([
+        "\n" + "=" * 60,
+        "Select improvement modes to run",
+        "=" * 60 + "\n",
+        *(f"  [{i:2}] {spec.name:25} - {spec.description}" for i, spec in enumerate(MODES.values(), 1)),
+        "\n  [ 0] All modes",
+        "  [ q] Quit",
+        "\nEnter mode numbers separated by space (e.g., '1 3 5'), or '0' for all:",
+    ]))
 
     try:
         choice = input("> ").strip().lower()
@@ -878,7 +968,7 @@ def select_modes_interactive() -> list[str]:
             if 0 <= idx < len(modes):
                 selected.append(modes[idx])
         except ValueError:
-            if num in modes:
+            if num in MODES:
                 selected.append(num)
     return selected
 
@@ -886,11 +976,39 @@ def select_modes_interactive() -> list[str]:
 # CORE CLASSES
 # ============================================================================
 
+def pid_is_alive(pid: int) -> bool:
+    """Check whether a process with the given PID is still running.
+
+    Uses pidfd_open(2) on Linux 5.3+, which answers in a single syscall and
+    cannot be fooled by signal permission errors. Falls back to kill(pid, 0)
+    on other platforms.
+    """
+    if pid <= 0:
+        return False
+    if hasattr(os, "pidfd_open"):
+        try:
+            os.close(os.pidfd_open(pid))
+            return True
+        except ProcessLookupError:
+            return False
+        except OSError:
+            pass  # pidfd unsupported by this kernel, fall back to kill()
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Process exists but belongs to another user
+    return True
+
+
 class LockFile:
-    """File-based lock to prevent concurrent execution of the automator.
+    """PID-file lock to prevent concurrent execution of the automator.
 
-    Uses fcntl.flock for advisory locking. The lock file contains the PID
-    and timestamp of the process that acquired the lock.
+    The lock file is created atomically with O_CREAT | O_EXCL and contains the
+    PID and timestamp of the process that acquired the lock. If the file already
+    exists, the owner's liveness is checked and a lock left behind by a dead
+    process is reclaimed automatically.
 
     Can be used as a context manager for automatic cleanup:
         with LockFile(path) as lock:
@@ -898,9 +1016,13 @@ class LockFile:
                 # do work while holding the lock
     """
 
+    # A lock file whose PID can't be parsed is only treated as stale once it is
+    # this old, so we don't steal a lock another process is still writing.
+    UNREADABLE_GRACE_SECONDS = 5.0
+
     def __init__(self, path: Path) -> None:
         self.path = path
-        self.fd: IO[str] | None = None
+        self.fd: int | None = None
         self.acquired: bool = False
 
     def __enter__(self) -> "LockFile":
@@ -912,65 +1034,870 @@ class LockFile:
         """Context manager exit - releases the lock."""
         self.release()
 
+    @staticmethod
+    def _parse_pid(text: str) -> int | None:
+        try:
+            return int(text.split("\n", 1)[0].strip())
+        except ValueError:
+            return None
+
+    def owner_pid(self) -> int | None:
+        """Return the PID recorded in the lock file, or None if unreadable."""
+        try:
+            return self._parse_pid(self.path.read_text())
+        except OSError:
+            return None
+
+    def _reclaim_if_stale(self) -> bool:
+        """Remove the lock file if its owner is gone. Returns True if removed.
+
+        The file is only unlinked if it is still the one whose PID was read:
+        another process may have reclaimed it and created a fresh lock since.
+        It is held open until then so its inode can't be reused by that lock.
+        """
+        try:
+            f = open(self.path)
+        except FileNotFoundError:
+            return True  # Owner released it in the meantime
+        except OSError:
+            return False
+        with f:
+            try:
+                st = os.fstat(f.fileno())
+                pid = self._parse_pid(f.read())
+            except (OSError, UnicodeDecodeError):
+                return False
+            if pid is None:
+                if time.time() - st.st_mtime < self.UNREADABLE_GRACE_SECONDS:
+                    return False
+            elif pid_is_alive(pid):
+                return False
+            try:
+                current = self.path.stat()
+                if (current.st_dev, current.st_ino) != (st.st_dev, st.st_ino):
+                    return False  # Replaced by another process's lock
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                return False
+        return True
+
     def acquire(self) -> bool:
         """Attempt to acquire the lock. Returns True if successful."""
-        try:
-            self.fd = open(self.path, 'w')
-            fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-            self.fd.write(f"{os.getpid()}\n{datetime.now().isoformat()}\n")
-            self.fd.flush()
+        # Two attempts: the second one follows reclaiming a stale lock file
+        for _ in range(2):
+            try:
+                self.fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if self._reclaim_if_stale():
+                    continue
+                break
+            except OSError:
+                break
+            os.write(self.fd, f"{os.getpid()}\n{datetime.now().isoformat()}\n".encode())
             self.acquired = True
             return True
-        except (IOError, OSError):
-            if self.fd:
-                self.fd.close()
-                self.fd = None
-            self.acquired = False
-            return False
+        self.acquired = False
+        return False
 
     def release(self) -> None:
-        """Release the lock and remove the lock file."""
-        if self.fd:
+        """Release the lock and remove the lock file if we own it."""
+        if self.fd is None:
+            return
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+        finally:
+            self.fd = None
+        if self.acquired:
+            self.acquired = False
             try:
-                fcntl.flock(self.fd, fcntl.LOCK_UN)
-                self.fd.close()
-            except OSError:
+                self.path.unlink()
+            except (FileNotFoundError, PermissionError):
                 pass
-            finally:
-                self.fd = None
-                self.acquired = False
+
+
+# Shared keep-alive connection to the Telegram Bot API, so each notification
+# reuses one TLS session instead of paying a fresh handshake.
+_TELEGRAM_HOST = "api.telegram.org"
+_tg_conn: http.client.HTTPSConnection | None = None
+_tg_lock = threading.Lock()
+
+# Resolved addresses for _TELEGRAM_HOST, pinned so reconnects skip DNS.
+# Re-resolved after _TELEGRAM_ADDR_TTL seconds or when no address connects.
+_TELEGRAM_ADDR_TTL = 600
+_tg_addrs: list[tuple] = []
+_tg_addrs_expire = 0.0
+
+
+def _tg_resolve() -> list[tuple]:
+    """Return the pinned Telegram addresses, resolving them if missing or expired."""
+    global _tg_addrs, _tg_addrs_expire
+    if not _tg_addrs or time.monotonic() >= _tg_addrs_expire:
+        _tg_addrs = socket.getaddrinfo(_TELEGRAM_HOST, 443, socket.AF_UNSPEC, socket.SOCK_STREAM)
+        _tg_addrs_expire = time.monotonic() + _TELEGRAM_ADDR_TTL
+    return _tg_addrs
+
+
+def _tg_open_socket(timeout: float) -> socket.socket:
+    """Open a TCP connection to the first pinned Telegram address that accepts."""
+    global _tg_addrs_expire
+    last_error: OSError | None = None
+    for family, sock_type, proto, _, sockaddr in _tg_resolve():
+        sock = socket.socket(family, sock_type, proto)
         try:
-            self.path.unlink()
-        except (FileNotFoundError, PermissionError):
-            pass
+            sock.settimeout(timeout)
+            sock.connect(sockaddr)
+            return sock
+        except OSError as e:
+            sock.close()
+            last_error = e
+    # None of the pinned addresses worked; resolve again on the next attempt
+    _tg_addrs_expire = 0.0
+    raise last_error or OSError(f"No addresses for {_TELEGRAM_HOST}")
+
+
+class _TelegramConnection(http.client.HTTPSConnection):
+    """HTTPS connection to the Telegram Bot API over a pinned address.
+
+    Overrides connect() to skip DNS; TLS still uses the real hostname for
+    SNI and certificate checks.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self.ssl_context = ssl.create_default_context()
+        super().__init__(_TELEGRAM_HOST, timeout=timeout, context=self.ssl_context)
+
+    def connect(self) -> None:
+        sock = _tg_open_socket(self.timeout)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.sock = self.ssl_context.wrap_socket(sock, server_hostname=self.host)
+        except BaseException:
+            sock.close()
+            raise
+
+
+def _tg_request(path: str, body: bytes) -> tuple[int, bytes, str | None]:
+    """Send one request on the shared connection, dropping it on any failure."""
+    global _tg_conn
+    if _tg_conn is None:
+        _tg_conn = _TelegramConnection(timeout=10)
+    try:
+        _tg_conn.request("POST", path, body, headers={
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
+        })
+        response = _tg_conn.getresponse()
+        return response.status, response.read(), response.getheader("Retry-After")
+    except (http.client.HTTPException, OSError):
+        _tg_conn.close()
+        _tg_conn = None
+        raise
+
+
+def _tg_post(path: str, body: bytes) -> tuple[int, bytes, str | None]:
+    """POST a JSON body to the Telegram Bot API over the shared connection.
+
+    Returns:
+        Tuple of (HTTP status, response body, Retry-After header or None).
+    """
+    with _tg_lock:
+        try:
+            return _tg_request(path, body)
+        except (http.client.BadStatusLine, ConnectionResetError, BrokenPipeError):
+            # The server closed the idle keep-alive connection; retry on a fresh one
+            return _tg_request(path, body)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Sleep until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class TelegramQueue:
+    """Rate-limited, coalescing delivery queue for Telegram notifications.
+
+    Producers call put() and return immediately; a background thread delivers
+    the messages. The sender holds the first message of a batch for
+    COALESCE_WINDOW seconds, and messages that arrive meanwhile or pile up while
+    waiting are joined into a single Telegram message (up to the 4096 character
+    limit). Sends are paced by a token bucket sized to Telegram's per-chat
+    limit of 20 messages per minute; queues for the same chat share one bucket,
+    so concurrent workers posting to a chat stay under the limit together. On
+    HTTP 429 the batch is retried after the server's retry_after instead of
+    being dropped. Beyond MAX_PENDING queued messages the oldest are dropped
+    and counted in `dropped`.
+
+    The window can be widened (see TelegramNotifier.cycle()) so a whole review
+    cycle's updates go out in a few sends; flush() cuts the current window short.
+    """
+
+    MAX_MESSAGE_CHARS = 4096
+    SEPARATOR = "\n---\n"
+    RATE_PER_SECOND = 20 / 60
+    BURST = 3
+    MAX_PENDING = 100
+    MAX_RETRIES = 5
+    EXIT_FLUSH_TIMEOUT = 30  # Seconds to wait for pending messages at interpreter exit
+    COALESCE_WINDOW = 0.5  # Seconds to collect bursts of status updates into one send
+    CYCLE_FLUSH_INTERVAL = 3.0  # Coalescing window while a review cycle is running
+
+    _buckets: dict[str, TokenBucket] = {}
+    _buckets_lock = threading.Lock()
+
+    def __init__(self, deliver: Callable[[str], tuple[bool, float | None]], chat_id: str | None = None) -> None:
+        self._deliver = deliver
+        self._pending: deque[str] = deque(maxlen=self.MAX_PENDING)
+        self._cond = threading.Condition()
+        self._in_flight = False
+        self._thread: threading.Thread | None = None
+        bucket = TokenBucket(self.RATE_PER_SECOND, self.BURST)
+        if chat_id is not None:
+            with self._buckets_lock:
+                bucket = self._buckets.setdefault(chat_id, bucket)
+        self._bucket = bucket
+        self.dropped = 0
+        self.coalesce_window = self.COALESCE_WINDOW
+        self._flush_requested = False
+
+    def put(self, message: str) -> None:
+        """Queue a message for delivery, starting the sender thread if needed."""
+        parts = self.split_message(message)
+        with self._cond:
+            overflow = len(self._pending) + len(parts) - self.MAX_PENDING
+            if overflow > 0:
+                self.dropped += overflow
+                print(f"Telegram queue full, dropping {overflow} oldest message(s) ({self.dropped} so far)")
+            self._pending.extend(parts)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="telegram-sender", daemon=True)
+                self._thread.start()
+                # The sender is a daemon thread; flush what's left when the process exits
+                atexit.register(self.join, self.EXIT_FLUSH_TIMEOUT)
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Send what is pending now instead of waiting out the coalescing window."""
+        with self._cond:
+            if self._pending:
+                self._flush_requested = True
+                self._cond.notify_all()
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Block until every queued message has been delivered (or given up on).
+
+        Returns False if timeout elapsed with messages still pending.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not (self._pending or self._in_flight), timeout)
+
+    @classmethod
+    def split_message(cls, message: str) -> list[str]:
+        """Split a message over the Telegram limit, preferring paragraph boundaries."""
+        chunks: list[str] = []
+        while len(message) > cls.MAX_MESSAGE_CHARS:
+            cut = cls._split_point(message)
+            chunks.append(message[:cut])
+            message = message[cut:].lstrip("\n")
+        if message or not chunks:
+            chunks.append(message)
+        return chunks
+
+    @classmethod
+    def _split_point(cls, text: str) -> int:
+        """Index to cut text at, at most MAX_MESSAGE_CHARS and outside any Markdown entity.
+
+        Tracks legacy Markdown spans (*bold*, _italic_, `code`, ```pre```,
+        [text](url)) and backslash escapes, and picks the last blank line,
+        else the last newline, else the last position where no span is open.
+        Only a single span longer than the limit is cut through.
+        """
+        limit = cls.MAX_MESSAGE_CHARS
+        safe = paragraph = line = 0
+        closer = None  # Markup that ends the open span, if any
+        i = 0
+        while i < limit:
+            if closer is None:
+                safe = i
+                if text.startswith("\n\n", i):
+                    paragraph = i
+                elif text[i] == "\n":
+                    line = i
+                if text[i] == "\\":
+                    i += 2
+                    continue
+                if text.startswith("```", i):
+                    closer = "```"
+                    i += 3
+                    continue
+                if text[i] in "*_`":
+                    closer = text[i]
+                elif text[i] == "[":
+                    closer = ")"
+            elif text.startswith(closer, i):
+                i += len(closer)
+                closer = None
+                continue
+            i += 1
+        if closer is None and i == limit:
+            safe = limit
+        return paragraph or line or safe or limit
+
+    def _take_batch(self) -> str:
+        """Pop as many pending messages as fit in one Telegram message."""
+        batch = self._pending.popleft()[:self.MAX_MESSAGE_CHARS]
+        while self._pending:
+            candidate = f"{batch}{self.SEPARATOR}{self._pending[0]}"
+            if len(candidate) > self.MAX_MESSAGE_CHARS:
+                break
+            batch = candidate
+            self._pending.popleft()
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # Let a burst of updates (e.g. PR created + review started) arrive first
+                deadline = time.monotonic() + self.coalesce_window
+                while not self._flush_requested and (remaining := deadline - time.monotonic()) > 0:
+                    self._cond.wait(remaining)
+                batch = self._take_batch()
+                if not self._pending:
+                    self._flush_requested = False
+                self._in_flight = True
+            try:
+                self._bucket.acquire()
+                for _ in range(self.MAX_RETRIES):
+                    _, retry_after = self._deliver(batch)
+                    if retry_after is None:
+                        break
+                    time.sleep(retry_after)
+            except Exception as e:
+                # Keep the sender alive; put() won't start another one
+                print(f"Telegram notification dropped after unexpected error: {e!r}")
+            finally:
+                with self._cond:
+                    self._in_flight = False
+                    self._cond.notify_all()
+
+
+# Shared skeletons for the cycle outcome notifications
+_TG_FAILED = "⚠️ *Auto-Review Failed*\n\n{reason}"
+_TG_COMPLETE = "✅ *Auto-Review Complete*\n\n{detail}"
+
+# Telegram legacy Markdown treats these as markup; escape them in dynamic text
+_TG_ESCAPE_TABLE = str.maketrans({"_": r"\_", "*": r"\*", "`": r"\`", "[": r"\["})
+
+
+def tg_escape(text: str) -> str:
+    """Escape Markdown markup characters in text interpolated into a Telegram message."""
+    return text.translate(_TG_ESCAPE_TABLE)
 
 
 class TelegramNotifier:
-    """Sends notifications to Telegram when review cycles complete or fail."""
+    """Sends notifications to Telegram when review cycles complete or fail.
+
+    send() only queues the message; delivery happens on a background thread
+    through a TelegramQueue. Call join() before exiting to drain the queue.
+    """
 
     def __init__(self, bot_token: str | None, chat_id: str | None) -> None:
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.enabled = bool(bot_token and chat_id)
+        self._send_path = f"/bot{bot_token}/sendMessage"
+        self._queue = TelegramQueue(self.deliver, chat_id)
 
     def send(self, message: str) -> bool:
-        """Send a message to the configured Telegram chat. Returns True on success."""
+        """Queue a message for the configured Telegram chat. Returns True if queued."""
         if not self.enabled:
             return False
+        self._queue.put(message)
+        return True
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait for queued messages to be delivered. Returns False on timeout."""
+        if self.enabled:
+            return self._queue.join(timeout)
+        return True
+
+    @contextlib.contextmanager
+    def cycle(self):
+        """Coalesce notifications over a review cycle and flush them when it ends.
+
+        Inside the block the queue collects messages for CYCLE_FLUSH_INTERVAL
+        seconds before each send, so a cycle's status updates arrive as a few
+        combined messages instead of one request each.
+        """
+        self._queue.coalesce_window = TelegramQueue.CYCLE_FLUSH_INTERVAL
         try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-            data = urllib.parse.urlencode({
-                "chat_id": self.chat_id,
-                "text": message,
-                "parse_mode": "Markdown",
-                "disable_web_page_preview": "true"
-            }).encode('utf-8')
-            req = urllib.request.Request(url, data=data)
-            with urllib.request.urlopen(req, timeout=10) as response:
-                return response.status == 200
-        except (urllib.error.URLError, OSError) as e:
+            yield self
+        finally:
+            self._queue.coalesce_window = TelegramQueue.COALESCE_WINDOW
+            self._queue.flush()
+
+    def deliver(self, message: str, parse_mode: str | None = "Markdown") -> tuple[bool, float | None]:
+        """Send a message synchronously.
+
+        If Telegram can't parse the Markdown (e.g. an unescaped _ in a branch
+        name), the message is resent once as plain text rather than lost.
+
+        Returns:
+            Tuple of (success, retry_after). retry_after is set when Telegram
+            rate-limited the request (HTTP 429) and the message should be
+            retried after that many seconds.
+        """
+        payload = {
+            "chat_id": self.chat_id,
+            "text": message,
+            "disable_web_page_preview": True,
+        }
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+        body = _dumps_bytes(payload)
+        try:
+            status, response, retry_after = _tg_post(self._send_path, body)
+        except (http.client.HTTPException, OSError) as e:
             print(f"Failed to send Telegram message: {e}")
+            return False, None
+        if status == 429:
+            return False, self._retry_after(response, retry_after)
+        if status == 400 and parse_mode and b"can't parse entities" in response:
+            return self.deliver(message, parse_mode=None)
+        if status != 200:
+            print(f"Failed to send Telegram message: HTTP {status}")
+            return False, None
+        return True, None
+
+    @staticmethod
+    def _retry_after(body: bytes, header: str | None) -> float:
+        """Extract the retry delay from a 429 response body or Retry-After header."""
+        try:
+            return float(_loads(body)["parameters"]["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            pass
+        try:
+            return float(header) if header else 1.0
+        except ValueError:
+            return 1.0
+
+
+def fast_check_output(argv: Sequence[str], timeout: float = 60) -> tuple[int, bytes]:
+    """Run a small argv-only command and return (exit code, stdout).
+
+    Spawns with os.posix_spawnp and reads a plain pipe, skipping the Popen
+    machinery for the tiny git queries made several times per cycle.
+    stderr is discarded. A command still running after `timeout` seconds is
+    killed, so it reports a negative exit code. Falls back to subprocess
+    where posix_spawnp is unavailable. Raises FileNotFoundError if the
+    command doesn't exist.
+    """
+    if not hasattr(os, "posix_spawnp"):
+        try:
+            result = subprocess.run(argv, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=timeout)
+        except subprocess.TimeoutExpired as e:
+            return -1, e.stdout or b""
+        return result.returncode, result.stdout
+
+    # os.pipe() fds are close-on-exec; DUP2 makes a non-CLOEXEC copy as fd 1
+    read_fd, write_fd = os.pipe()
+    try:
+        pid = os.posix_spawnp(argv[0], list(argv), os.environ, file_actions=[
+            (os.POSIX_SPAWN_DUP2, write_fd, 1),
+            (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+        ])
+    except BaseException:
+        os.close(read_fd)
+        raise
+    finally:
+        os.close(write_fd)
+
+    deadline = time.monotonic() + timeout
+    chunks = []
+    with open(read_fd, "rb", buffering=0) as pipe, selectors.DefaultSelector() as selector:
+        selector.register(pipe, selectors.EVENT_READ)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not selector.select(remaining):
+                # Hung (e.g. on a stuck filesystem); don't hold the review lock forever
+                os.kill(pid, signal.SIGKILL)
+                break
+            chunk = pipe.read(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status), b"".join(chunks)
+
+
+# owner/name from an HTTPS or SSH GitHub remote URL
+_GITHUB_REMOTE_RE = re.compile(r"github\.com[:/]([^/\s]+/[^/\s]+?)(?:\.git)?/?$")
+
+
+class GitHubUnreachable(ConnectionError):
+    """A GitHub API request failed before it was fully sent, so GitHub never acted on it."""
+
+
+class GitHubClient:
+    """Minimal GitHub REST client for the PR calls in the review cycle.
+
+    Reuses one keep-alive HTTPS connection to api.github.com instead of
+    starting the gh CLI, which authenticates and opens a new TLS session,
+    for every call. The token comes from GH_TOKEN/GITHUB_TOKEN or a single
+    `gh auth token` call, and the repository from the origin remote. If
+    either is missing, `available` is False and callers use the gh CLI.
+    """
+
+    API_HOST = "api.github.com"
+    MAX_RATE_LIMIT_WAIT = 900  # Don't sleep longer than this for a rate-limit reset
+
+    def __init__(self, project_dir: Path) -> None:
+        self.project_dir = project_dir
+        self.token: str | None = None
+        self.repo: str | None = None  # "owner/name"
+        self._resolved = False
+        self._conn: http.client.HTTPSConnection | None = None
+
+    @property
+    def available(self) -> bool:
+        """Whether a token and a GitHub repository were found (resolved once)."""
+        if not self._resolved:
+            self._resolved = True
+            self.token = self._find_token()
+            self.repo = self._find_repo()
+        return bool(self.token and self.repo)
+
+    def _find_token(self) -> str | None:
+        token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+        if token:
+            return token
+        try:
+            code, output = fast_check_output(("gh", "auth", "token"))
+        except OSError:
+            return None
+        if code != 0:
+            return None
+        return output.decode("utf-8", errors="replace").strip() or None
+
+    def _find_repo(self) -> str | None:
+        try:
+            code, output = fast_check_output(
+                ("git", "-C", str(self.project_dir), "remote", "get-url", "origin")
+            )
+        except OSError:
+            return None
+        if code != 0:
+            return None
+        match = _GITHUB_REMOTE_RE.search(output.decode("utf-8", errors="replace").strip())
+        return match.group(1) if match else None
+
+    def _send_once(self, method: str, path: str, body: bytes | None, headers: dict) -> http.client.HTTPResponse:
+        """Send one request on the shared connection, dropping it on any failure.
+
+        Raises GitHubUnreachable if the request could not be written in full;
+        errors while waiting for the response are re-raised as is, since the
+        server may already have acted on the request.
+        """
+        if self._conn is None:
+            self._conn = http.client.HTTPSConnection(self.API_HOST, timeout=30)
+        try:
+            self._conn.request(method, path, body, headers=headers)
+        except (http.client.HTTPException, OSError) as e:
+            self._conn.close()
+            self._conn = None
+            raise GitHubUnreachable(f"{method} {path} was not sent: {e}") from e
+        try:
+            return self._conn.getresponse()
+        except (http.client.HTTPException, OSError):
+            self._conn.close()
+            self._conn = None
+            raise
+
+    def _drop_stale_connection(self) -> None:
+        """Close the kept-alive connection if GitHub has already closed its end.
+
+        An idle connection has nothing to read, so a readable socket means EOF.
+        Writing a request to it would fail only after it was sent, when it can
+        no longer be retried safely.
+        """
+        sock = self._conn.sock if self._conn is not None else None
+        if sock is None:
+            return
+        with selectors.DefaultSelector() as selector:
+            selector.register(sock, selectors.EVENT_READ)
+            if selector.select(0):
+                self._conn.close()
+                self._conn = None
+
+    def _send(self, method: str, path: str, body: bytes | None) -> http.client.HTTPResponse:
+        headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "let-claude-code",
+            "Connection": "keep-alive",
+        }
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        self._drop_stale_connection()
+        reused = self._conn is not None
+        try:
+            return self._send_once(method, path, body, headers)
+        except GitHubUnreachable:
+            if not reused:
+                raise
+            # The kept-alive connection died before the request went out; resending can't duplicate it
+            return self._send_once(method, path, body, headers)
+
+    def request(self, method: str, path: str, payload: dict | None = None) -> tuple[int, dict]:
+        """Call the REST API and return (status, decoded JSON body).
+
+        When the rate limit is exhausted (403/429 with X-RateLimit-Remaining
+        of 0), waits for X-RateLimit-Reset and retries once.
+        """
+        body = _dumps_bytes(payload) if payload is not None else None
+        for attempt in range(2):
+            response = self._send(method, path, body)
+            data = response.read()
+            limited = response.status in (403, 429) and response.getheader("X-RateLimit-Remaining") == "0"
+            if limited and attempt == 0:
+                try:
+                    wait = int(response.getheader("X-RateLimit-Reset", "")) - time.time()
+                except ValueError:
+                    wait = -1
+                if 0 < wait <= self.MAX_RATE_LIMIT_WAIT:
+                    print(f"GitHub rate limit reached, waiting {int(wait)}s...")
+                    time.sleep(wait)
+                    continue
+            break
+        try:
+            return response.status, _loads(data) if data else {}
+        except ValueError:
+            return response.status, {}
+
+    def create_pull(self, title: str, body: str, head: str, base: str) -> str | None:
+        """Open a pull request and return its URL, or None on failure."""
+        status, data = self.request("POST", f"/repos/{self.repo}/pulls", {
+            "title": title, "body": body, "head": head, "base": base,
+        })
+        return data.get("html_url") if status == 201 else None
+
+    def merge_pull(self, number: str, delete_branch: str | None = None) -> bool:
+        """Squash-merge a pull request, then delete its head branch if given."""
+        status, _ = self.request("PUT", f"/repos/{self.repo}/pulls/{number}/merge", {"merge_method": "squash"})
+        if status != 200:
             return False
+        if delete_branch:
+            try:
+                self.request("DELETE", f"/repos/{self.repo}/git/refs/heads/{urllib.parse.quote(delete_branch)}")
+            except (http.client.HTTPException, OSError):
+                pass  # The merge went through; a leftover remote branch is harmless
+        return True
+
+
+class LineReader:
+    """Reads lines from a subprocess pipe by selecting on its raw fd.
+
+    Waits in select() until output or EOF arrives instead of polling
+    readline() with short sleeps, and reads with os.read() into a buffer so
+    partial lines are held until their newline shows up.
+    """
+
+    CHUNK_SIZE = 65536
+
+    def __init__(self, pipe) -> None:
+        self.fd = pipe.fileno()
+        os.set_blocking(self.fd, False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.fd, selectors.EVENT_READ)
+        self._buffer = bytearray()
+        self._eof = False
+
+    def readline(self, timeout: float | None = None) -> str | None:
+        """Return the next line, "" at EOF, or None if timeout seconds pass first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            end = self._buffer.find(b"\n") + 1
+            if end or self._eof:
+                end = end or len(self._buffer)
+                line = bytes(self._buffer[:end])
+                del self._buffer[:end]
+                return line.decode("utf-8", errors="replace")
+
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+            if not self._selector.select(remaining):
+                continue
+            try:
+                chunk = os.read(self.fd, self.CHUNK_SIZE)
+            except BlockingIOError:
+                continue
+            if chunk:
+                self._buffer += chunk
+            else:
+                self._eof = True
+
+    def close(self) -> None:
+        self._selector.close()
+
+
+class ClaudeWorker:
+    """Long-lived Claude CLI process driven over line-delimited JSON on stdio.
+
+    Spawned once with --input-format stream-json; each prompt is written to
+    its stdin as a user message and answered by a stream of JSON events
+    ending in a "result" event. This avoids paying process startup and auth
+    on every improve/review/fix call. If the process exits it is restarted
+    on the next request, resuming the last known session.
+    """
+
+    def __init__(self, project_dir: Path, claude_flags: str | None = None) -> None:
+        self.project_dir = project_dir
+        self.claude_flags = claude_flags
+        self.session_id: str | None = None
+        self.process: subprocess.Popen | None = None
+        self.reader: LineReader | None = None
+
+    def build_command(self, session_id: str | None = None) -> list[str]:
+        """Build the argv used to start the worker."""
+        cmd = [
+            "claude", "--print",
+            "--input-format", "stream-json",
+            "--output-format", "stream-json",
+            "--verbose",
+        ]
+        if session_id:
+            cmd += ["--resume", session_id]
+        # Add any additional claude flags specified by user
+        if self.claude_flags:
+            cmd += [os.path.expanduser(flag) for flag in shlex.split(self.claude_flags)]
+        return cmd
+
+    def is_alive(self) -> bool:
+        """Check whether the worker process is still running."""
+        return self.process is not None and self.process.poll() is None
+
+    def ensure_running(self, session_id: str | None = None) -> None:
+        """Start the worker, or restart it if it died or the session changed."""
+        if self.is_alive() and session_id == self.session_id:
+            return
+        self.close()
+        self.process = subprocess.Popen(
+            self.build_command(session_id),
+            cwd=self.project_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            close_fds=False,
+        )
+        self.reader = LineReader(self.process.stdout)
+        self.session_id = session_id
+
+    def send(self, prompt: str, suffix: str | None = None) -> None:
+        """Write a prompt to the worker as a stream-json user message.
+
+        A per-run suffix goes in its own trailing text block, so the prompt
+        block stays byte-identical across runs and remains a cacheable prefix.
+        """
+        content: str | list[dict] = prompt
+        if suffix:
+            content = [{"type": "text", "text": prompt}, {"type": "text", "text": suffix}]
+        message = {"type": "user", "message": {"role": "user", "content": content}}
+        self.process.stdin.write(_dumps_bytes(message) + b"\n")
+        self.process.stdin.flush()
+
+    def readline(self, timeout: float | None = None) -> str | None:
+        """Read one line of output: "" at EOF, None if the timeout expired."""
+        return self.reader.readline(timeout)
+
+    def kill(self) -> None:
+        """Kill the worker immediately, e.g. after a timeout."""
+        if self.process is None:
+            return
+        self.process.kill()
+        self._reap(self.process)
+
+    def close(self) -> None:
+        """Close the worker's stdin and wait for it to exit."""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self._reap(self.process)
+
+    def _reap(self, process: subprocess.Popen) -> None:
+        process.wait()
+        self.reader.close()
+        process.stdout.close()
+        self.process = None
+        self.reader = None
+
+
+# Fixed git argv, built once; commands with arguments extend these tuples
+GIT_CURRENT_BRANCH = ("git", "rev-parse", "--abbrev-ref", "HEAD")
+GIT_HEAD = ("git", "rev-parse", "HEAD")
+GIT_CHECKOUT = ("git", "checkout")
+GIT_PULL_REBASE = ("git", "pull", "--rebase")
+GIT_LOG_ONELINE = ("git", "log", "--oneline")
+GIT_RECENT_LOG = ("git", "log", "--oneline", "-10")
+GIT_RECENT_DIFF_STAT = ("git", "diff", "--stat", "HEAD~3..HEAD")
+
+# Phrases Claude uses when it is waiting for user input (see detect_question)
+_QUESTION_RE = re.compile("|".join([
+    r"what would you like me to",
+    r"how should i proceed",
+    r"would you like me to",
+    r"should i continue",
+    r"do you want me to",
+    r"let me know what",
+    r"please tell me",
+    r"what would you like",
+    r"should i make the changes",
+    r"would you like to proceed",
+    r"is this okay",
+    r"is this correct",
+    r"does this look right",
+    r"are you happy with",
+]), re.IGNORECASE)
+
+# Reviewer feedback following a CHANGES_REQUESTED verdict
+_CHANGES_REQUESTED_RE = re.compile(r'CHANGES_REQUESTED[:\s]*(.+)', re.DOTALL | re.IGNORECASE)
+
+# Pull request URL printed by `gh pr create`, and the number inside a PR URL
+_PR_URL_RE = re.compile(r'https://github\.com/\S+/pull/\d+')
+_PR_NUMBER_RE = re.compile(r'/pull/(\d+)')
 
 
 class AutoReviewer:
@@ -1007,12 +1934,22 @@ class AutoReviewer:
         self.auto_merge = auto_merge
         self.base_branch = base_branch
         self.log_file = self.project_dir / "auto_review.log"
+        self._log_fh = None  # Line-buffered handle to log_file, opened on first log()
         self.lock_file = LockFile(self.project_dir / ".auto_review.lock")
+        self.last_run_file = self.project_dir / ".auto_review_last"
+        self.skip_unchanged = False  # Skip cycles when no new commits since the last successful one
         self.current_branch: str | None = None
         self.telegram = TelegramNotifier(tg_bot_token, tg_chat_id)
+        self.github = GitHubClient(self.project_dir)
         self.max_iterations = max_iterations
         self.modes = modes or ["fix_bugs"]
         self.review_prompt = review_prompt or get_combined_prompt(self.modes)
+        self.custom_prompt = review_prompt is not None  # Goal/NORTHSTAR/file prompt instead of modes
+        self.sequential_modes = False  # Run each mode as its own Claude call
+        # Mode-derived strings used for every branch name and PR; modes don't change after init
+        spec = MODES.get(self.modes[0])
+        self._mode_prefix = spec.branch_prefix if spec else self.modes[0].replace("_", "-")
+        self._mode_names = ", ".join(MODES[m].name for m in self.modes if m in MODES) or "Unknown"
         self.session_cost = 0.0  # Cumulative cost across all runs
         self.session_id: str | None = None  # For continuing sessions
         self.think_level = think_level  # Thinking budget: normal, think, megathink, ultrathink
@@ -1025,11 +1962,11 @@ class AutoReviewer:
         self.auto_yes = auto_yes  # Skip confirmation prompts
         self.gemini_feedback: str | None = None  # Feedback from AI to incorporate in next iteration
         self.tool = tool  # Which coding tool to use: "claude" or "codex"
+        self._claude_worker: ClaudeWorker | None = None  # Started lazily by run_claude
 
     def get_mode_names(self) -> str:
         """Get human-readable names for the configured modes."""
-        names = [IMPROVEMENT_MODES[m]["name"] for m in self.modes if m in IMPROVEMENT_MODES]
-        return ", ".join(names) if names else "Unknown"
+        return self._mode_names
 
     # ============================================================================
     # SESSION MANAGEMENT
@@ -1193,7 +2130,6 @@ class AutoReviewer:
         try:
             import urllib.request
             import urllib.error
-            import json
 
             prompt = f"""You are helping an AI coding assistant (Claude) answer a question.
 
@@ -1231,7 +2167,7 @@ Provide a clear, direct answer that Claude can use. Be concise but thorough."""
                     "max_tokens": 4096 if model == "gpt-4o-mini" else 16384
                 }
 
-            data_str = json.dumps(data).encode('utf-8')
+            data_str = _dumps_bytes(data)
 
             req = urllib.request.Request(
                 url,
@@ -1244,7 +2180,7 @@ Provide a clear, direct answer that Claude can use. Be concise but thorough."""
             )
 
             with urllib.request.urlopen(req, timeout=60) as response:
-                result = json.loads(response.read().decode('utf-8'))
+                result = _loads(response.read())
 
                 # Extract text based on API type
                 if model == "gpt-5.2":
@@ -1281,7 +2217,6 @@ Provide a clear, direct answer that Claude can use. Be concise but thorough."""
         try:
             import urllib.request
             import urllib.error
-            import json
 
             url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}"
 
@@ -1311,7 +2246,7 @@ Provide a clear, direct answer that Claude can use. Be concise but thorough."""
                 }
             }
 
-            data_str = json.dumps(data).encode('utf-8')
+            data_str = _dumps_bytes(data)
 
             req = urllib.request.Request(
                 url,
@@ -1321,7 +2256,7 @@ Provide a clear, direct answer that Claude can use. Be concise but thorough."""
             )
 
             with urllib.request.urlopen(req, timeout=60) as response:
-                result = json.loads(response.read().decode('utf-8'))
+                result = _loads(response.read())
 
                 if result.get("candidates"):
                     answer = result["candidates"][0]["content"]["parts"][0]["text"]
@@ -1358,28 +2293,7 @@ Provide a clear, direct answer that Claude can use. Be concise but thorough."""
             return True
 
         # Check for common Claude input request patterns
-        question_patterns = [
-            r"what would you like me to",
-            r"how should i proceed",
-            r"would you like me to",
-            r"should i continue",
-            r"do you want me to",
-            r"let me know what",
-            r"please tell me",
-            r"what would you like",
-            r"should i make the changes",
-            r"would you like to proceed",
-            r"is this okay",
-            r"is this correct",
-            r"does this look right",
-            r"are you happy with",
-        ]
-
-        for pattern in question_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-
-        return False
+        return _QUESTION_RE.search(text) is not None
 
     def extract_question(self, text: str) -> str:
         """Extract the main question from Claude's output."""
@@ -1400,248 +2314,250 @@ Provide a clear, direct answer that Claude can use. Be concise but thorough."""
 
     def log(self, msg: str) -> None:
         """Log a message to stdout and the log file with timestamp."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_line = f"[{timestamp}] {msg}"
+        log_line = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {msg}"
         print(log_line)
         try:
-            with open(self.log_file, "a") as f:
-                f.write(log_line + "\n")
+            if self._log_fh is None:
+                self._log_fh = open(self.log_file, "a", buffering=1, encoding="utf-8")
+                atexit.register(self.close_log)
+            self._log_fh.write(log_line + "\n")
         except PermissionError:
             print(f"Warning: Cannot write to log file {self.log_file} (permission denied)")
         except OSError as e:
             print(f"Warning: Cannot write to log file {self.log_file}: {e}")
 
-    def run_cmd(self, cmd: list[str], timeout: int = 60) -> tuple[bool, str]:
-        """Run a shell command and return (success, output)."""
+    def close_log(self) -> None:
+        """Close the log file handle; the next log() reopens it."""
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
+
+    def run_cmd(self, cmd: Sequence[str], timeout: int = 60) -> tuple[bool, str]:
+        """Run a command and return (success, output).
+
+        Python opens fds non-inheritable by default, so close_fds=False is
+        safe and skips closing every fd up to the limit on each spawn. On
+        Ctrl+C the child gets the same SIGINT from the terminal; we wait for
+        it to exit instead of killing it (as subprocess.run would), so git
+        can remove its .git/index.lock before the daemon exits.
+        """
         try:
-            result = subprocess.run(
-                cmd, cwd=self.project_dir, capture_output=True, text=True, timeout=timeout
+            process = subprocess.Popen(
+                cmd, cwd=self.project_dir, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                text=True, close_fds=False,
             )
-            return result.returncode == 0, result.stdout + result.stderr
-        except subprocess.TimeoutExpired:
-            return False, f"Command timed out after {timeout}s: {' '.join(cmd)}"
         except FileNotFoundError:
             return False, f"Command not found: {cmd[0]}"
         except PermissionError:
             return False, f"Permission denied: {cmd[0]}"
         except OSError as e:
             return False, f"Failed to run {cmd[0]}: {e}"
-
-    def run_claude(self, prompt: str, timeout: int = 3600) -> tuple[bool, str]:
-        """Run Claude CLI with the given prompt, streaming output in real-time with usage stats."""
-        import atexit
-        import tempfile
-        import json
-
-
-        # Append thinking keyword if not normal
-        if self.think_level != "normal":
-            prompt = f"{prompt}\n\n{self.think_level}"
-
-        prompt_file = None
-
-        def cleanup_temp_file() -> None:
-            """Cleanup temp file on exit - registered with atexit for safety."""
-            if prompt_file and os.path.exists(prompt_file):
-                try:
-                    os.unlink(prompt_file)
-                except OSError:
-                    pass
-
-        try:
-            # Write prompt to a temp file to avoid command line length limits
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
-                f.write(prompt)
-                prompt_file = f.name
-
-            # Register cleanup with atexit in case of abnormal exit (SIGTERM, etc.)
-            # Note: SIGKILL cannot be caught, but this handles most other cases
-            atexit.register(cleanup_temp_file)
-
+        with process:
             try:
-                # Build command - use file redirection for prompt
-                base_cmd = "claude --print --output-format stream-json --verbose"
-                if self.session_id:
-                    base_cmd += f" --resume {self.session_id}"
-
-                # Add any additional claude flags specified by user
-                if self.claude_flags:
-                    expanded_flags = []
-                    for flag in self.claude_flags.split():
-                        expanded_flags.append(os.path.expanduser(flag))
-                    base_cmd += " " + " ".join(expanded_flags)
-
-                # Pass prompt via file redirection
-                cmd = ["bash", "-c", f"{base_cmd} < '{prompt_file}'"]
+                stdout, stderr = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                return False, f"Command timed out after {timeout}s: {' '.join(cmd)}"
+            except KeyboardInterrupt:
+                process.wait()
+                raise
+        return process.returncode == 0, stdout + stderr
+
+    async def _run_cmd_async(self, cmd: Sequence[str], timeout: int) -> tuple[bool, str]:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd, cwd=self.project_dir,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+                close_fds=False,
+            )
+        except FileNotFoundError:
+            return False, f"Command not found: {cmd[0]}"
+        except OSError as e:
+            return False, f"Failed to run {cmd[0]}: {e}"
+        try:
+            output, _ = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return False, f"Command timed out after {timeout}s: {' '.join(cmd)}"
+        return process.returncode == 0, output.decode("utf-8", errors="replace")
 
-                # Run claude with stdin from /dev/tty if available (for interactive use)
-                stdin_source = None
-                if os.path.exists("/dev/tty"):
-                    try:
-                        stdin_source = open("/dev/tty", "r")
-                    except OSError:
-                        pass
+    def run_cmds(self, cmds: Sequence[Sequence[str]], timeout: int = 60) -> list[tuple[bool, str]]:
+        """Run independent commands concurrently; return their (success, output) in order."""
+        async def gather() -> list[tuple[bool, str]]:
+            return await asyncio.gather(*(self._run_cmd_async(cmd, timeout) for cmd in cmds))
+        return asyncio.run(gather())
 
-                process = subprocess.Popen(
-                    cmd,
-                    cwd=self.project_dir,
-                    stdin=stdin_source,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                )
+    def git_query(self, argv: Sequence[str]) -> str | None:
+        """Run a read-only git query in the project dir; return stripped stdout, or None on failure."""
+        try:
+            code, output = fast_check_output((argv[0], "-C", str(self.project_dir), *argv[1:]))
+        except OSError:
+            return None
+        return output.decode("utf-8", errors="replace").strip() if code == 0 else None
 
-                result_data = {}
-                start_time = time.time()
+    def get_claude_worker(self) -> ClaudeWorker:
+        """Return the persistent Claude worker, (re)starting it if needed."""
+        if self._claude_worker is None:
+            self._claude_worker = ClaudeWorker(self.project_dir, self.claude_flags)
+            atexit.register(self.close_claude_worker)
+        self._claude_worker.ensure_running(self.session_id)
+        return self._claude_worker
 
-                # Keep track of recent conversation for AI context
-                conversation_history = []
-                max_context_chars = 8000  # Limit context size
+    def close_claude_worker(self) -> None:
+        """Shut down the persistent Claude worker, if one is running."""
+        if self._claude_worker is not None:
+            self._claude_worker.close()
 
-                while True:
-                    if time.time() - start_time > timeout:
-                        process.kill()
-                        return False, "Claude timed out"
+    def run_claude(self, prompt: str, timeout: int = 3600) -> tuple[bool, str]:
+        """Run a prompt on the persistent Claude worker, streaming output in real-time with usage stats."""
+        # Thinking keyword, if any, follows the prompt as a separate block
+        think_suffix = self.think_level if self.think_level != "normal" else None
 
-                    line = process.stdout.readline()
-                    if not line:
-                        if process.poll() is not None:
-                            break
-                        # Small sleep to avoid busy-waiting when no output available
-                        time.sleep(0.01)
-                        continue
+        try:
+            worker = self.get_claude_worker()
+            worker.send(prompt, think_suffix)
+        except FileNotFoundError:
+            return False, "Claude CLI not found"
+        except OSError as e:
+            # Broken pipe: the worker died between requests; restart next time
+            self.close_claude_worker()
+            return False, f"Failed to run Claude: {e}"
 
-                    line = line.strip()
-                    if not line:
-                        continue
+        result_data = {}
+        deadline = time.monotonic() + timeout
+
+        # Keep track of recent conversation for AI context; only a tail is ever kept,
+        # so a long session stays bounded in memory
+        conversation_history: deque[str] = deque()
+        history_chars = 0
+        max_context_chars = 8000  # Limit context size
+
+        while True:
+            line = worker.readline(deadline - time.monotonic())
+            if line is None:
+                worker.kill()
+                return False, "Claude timed out"
+            if not line:
+                # Worker exited mid-request; it is restarted on the next call
+                break
 
-                    try:
-                        data = json.loads(line)
-                        msg_type = data.get("type", "")
-
-                        # Handle user input requests from Claude
-                        # Note: With --print mode and bypassPermissions, Claude handles
-                        # tool permissions automatically and doesn't send input_required
-                        if msg_type == "input_required":
-                            question_text = data.get("message", {}).get("text", "") or data.get("description", "")
-                            print(f"\n\033[93m🤖 Claude asking: {question_text[:100]}...\033[0m")
-
-                            # With /dev/tty as stdin, user can provide input directly
-                            if self.use_ai:
-                                self.telegram.send(f"🤖 *Claude asking:*\n_{question_text[:200]}_")
-
-                                # Build context from recent conversation
-                                context_parts = [f"Project: {self.project_dir}"]
-                                if conversation_history:
-                                    context_parts.append("\nRecent conversation:")
-                                    for msg in conversation_history[-5:]:  # Last 5 messages
-                                        context_parts.append(f"- {msg[:200]}...")  # Truncate long messages
-                                context = "\n".join(context_parts)
-
-                                # Ask AI for answer
-                                answer = self.ask_ai(question_text, context)
-                                if answer:
-                                    print("\n\033[92m✨ AI generated answer\033[0m")
-                                    self.telegram.send("✨ *AI auto-answered*")
-                                else:
-                                    print("\n\033[91m⚠️ AI failed to generate answer\033[0m")
-                                    self.telegram.send("⚠️ *AI failed*")
-
-                        # Print assistant messages in real-time and capture for context
-                        if msg_type == "assistant" and "message" in data:
-                            content = data["message"].get("content", [])
-                            message_text = []
-                            for block in content:
-                                block_type = block.get("type")
-                                if block_type == "text":
-                                    text = block.get("text", "")
-                                    message_text.append(text)
-                                    print(text, end="", flush=True)
-                                elif block_type == "thinking":
-                                    # Print thinking content with visual distinction
-                                    thinking_text = block.get("thinking", "")
-                                    if thinking_text:
-                                        print("\n\033[2m--- Thinking ---\033[0m", flush=True)
-                                        for thought_line in thinking_text.split('\n'):
-                                            print(f"\033[2m{thought_line}\033[0m", flush=True)
-                                        print("\033[2m--- End Thinking ---\033[0m\n", flush=True)
-
-                            # Add to conversation history for AI context
-                            if message_text:
-                                full_text = "".join(message_text)
-                                conversation_history.append(full_text)
-                                # Trim history if it gets too large
-                                total_chars = sum(len(msg) for msg in conversation_history)
-                                while total_chars > max_context_chars and len(conversation_history) > 1:
-                                    removed = conversation_history.pop(0)
-                                    total_chars -= len(removed)
-
-                        # Capture final result with usage
-                        if msg_type == "result":
-                            result_data = data
-
-                    except json.JSONDecodeError:
-                        # Not JSON, print as-is
-                        print(line, flush=True)
-
-                success = process.returncode == 0
-
-                # Print usage summary from result
-                if result_data:
-                    # Save session_id for continuing future runs
-                    if "session_id" in result_data:
-                        self.session_id = result_data["session_id"]
-                        # Also save to sessions file for persistence across restarts
-                        self.save_session(self.session_id, prompt, result_data.get("total_cost_usd", 0))
-
-                    run_cost = result_data.get("total_cost_usd", 0)
-                    self.session_cost += run_cost
-                    usage = result_data.get("usage", {})
-                    input_tokens = usage.get("input_tokens", 0)
-                    output_tokens = usage.get("output_tokens", 0)
-                    cache_read = usage.get("cache_read_input_tokens", 0)
-                    cache_create = usage.get("cache_creation_input_tokens", 0)
-                    duration = result_data.get("duration_ms", 0) / 1000
-
-                    print(f"\n\n{'─'*60}")
-                    print(f"📊 Tokens: {input_tokens + output_tokens:,} (in: {input_tokens:,}, out: {output_tokens:,})")
-                    if cache_read or cache_create:
-                        print(f"💾 Cache: read {cache_read:,}, created {cache_create:,}")
-                    print(f"💰 This run: ${run_cost:.4f} | Session total: ${self.session_cost:.4f}")
-                    print(f"⏱️  Time: {duration:.1f}s")
-                    print("💡 Check quota: run 'claude' then type '/usage'")
-                    print(f"{'─'*60}\n")
-
-                # Get summary from Claude's actual response
-                if success:
-                    # Use the last message from conversation_history (Claude's final response)
-                    if conversation_history:
-                        summary = conversation_history[-1]  # Last message is the most recent
-                    else:
-                        # Fallback to git log if no conversation captured
-                        _, log_output = self.run_cmd(["git", "log", "--oneline", f"{self.base_branch}..HEAD"])
-                        summary = f"Changes made:\n{log_output}" if log_output.strip() else "Claude completed"
-                else:
-                    summary = "Claude failed"
+            line = line.strip()
+            if not line:
+                continue
 
-                return success, summary
-            finally:
-                # Clean up temp file and unregister atexit handler
-                if prompt_file and os.path.exists(prompt_file):
-                    os.unlink(prompt_file)
-                atexit.unregister(cleanup_temp_file)
+            try:
+                data = _loads(line)
+                msg_type = data.get("type", "")
+
+                # Handle user input requests from Claude
+                # Note: With --print mode and bypassPermissions, Claude handles
+                # tool permissions automatically and doesn't send input_required
+                if msg_type == "input_required":
+                    question_text = data.get("message", {}).get("text", "") or data.get("description", "")
+                    print(f"\n\033[93m🤖 Claude asking: {question_text[:100]}...\033[0m")
+
+                    # Claude's stdin is the stream-json pipe to the worker, so nobody can
+                    # type an answer; if use_ai is set, one is generated and reported
+                    if self.use_ai:
+                        self.telegram.send(f"🤖 *Claude asking:*\n{tg_escape(question_text[:200])}")
+
+                        # Build context from recent conversation
+                        context_parts = [f"Project: {self.project_dir}"]
+                        if conversation_history:
+                            context_parts.append("\nRecent conversation:")
+                            for msg in list(conversation_history)[-5:]:  # Last 5 messages
+                                context_parts.append(f"- {msg[:200]}...")  # Truncate long messages
+                        context = "\n".join(context_parts)
+
+                        # Ask AI for answer
+                        answer = self.ask_ai(question_text, context)
+                        if answer:
+                            print("\n\033[92m✨ AI generated answer\033[0m")
+                            self.telegram.send("✨ *AI auto-answered*")
+                        else:
+                            print("\n\033[91m⚠️ AI failed to generate answer\033[0m")
+                            self.telegram.send("⚠️ *AI failed*")
+
+                # Print assistant messages in real-time and capture for context
+                if msg_type == "assistant" and "message" in data:
+                    content = data["message"].get("content", [])
+                    message_text = []
+                    for block in content:
+                        block_type = block.get("type")
+                        if block_type == "text":
+                            text = block.get("text", "")
+                            message_text.append(text)
+                            print(text, end="", flush=True)
+                        elif block_type == "thinking":
+                            # Print thinking content with visual distinction
+                            thinking_text = block.get("thinking", "")
+                            if thinking_text:
+                                print("\n\033[2m--- Thinking ---\033[0m", flush=True)
+                                for thought_line in thinking_text.split('\n'):
+                                    print(f"\033[2m{thought_line}\033[0m", flush=True)
+                                print("\033[2m--- End Thinking ---\033[0m\n", flush=True)
+
+                    # Add to conversation history for AI context
+                    if message_text:
+                        full_text = "".join(message_text)
+                        conversation_history.append(full_text)
+                        history_chars += len(full_text)
+                        # Trim history if it gets too large
+                        while history_chars > max_context_chars and len(conversation_history) > 1:
+                            history_chars -= len(conversation_history.popleft())
+
+                # Capture final result with usage; it ends this request
+                if msg_type == "result":
+                    result_data = data
+                    break
 
-                # Close stdin source if we opened it
-                if 'stdin_source' in dir() and stdin_source and not stdin_source.closed:
-                    try:
-                        stdin_source.close()
-                    except OSError:
-                        pass
+            except json.JSONDecodeError:
+                # Not JSON, print as-is
+                print(line, flush=True)
+
+        success = bool(result_data) and not result_data.get("is_error", False)
+
+        # Print usage summary from result
+        if result_data:
+            # Save session_id for continuing future runs
+            if "session_id" in result_data:
+                self.session_id = worker.session_id = result_data["session_id"]
+                # Also save to sessions file for persistence across restarts
+                self.save_session(self.session_id, prompt, result_data.get("total_cost_usd", 0))
+
+            run_cost = result_data.get("total_cost_usd", 0)
+            self.session_cost += run_cost
+            usage = result_data.get("usage", {})
+            input_tokens = usage.get("input_tokens", 0)
+            output_tokens = usage.get("output_tokens", 0)
+            cache_read = usage.get("cache_read_input_tokens", 0)
+            cache_create = usage.get("cache_creation_input_tokens", 0)
+            duration = result_data.get("duration_ms", 0) / 1000
+
+            print(f"\n\n{'─'*60}")
+            print(f"📊 Tokens: {input_tokens + output_tokens:,} (in: {input_tokens:,}, out: {output_tokens:,})")
+            if cache_read or cache_create:
+                print(f"💾 Cache: read {cache_read:,}, created {cache_create:,}")
+            print(f"💰 This run: ${run_cost:.4f} | Session total: ${self.session_cost:.4f}")
+            print(f"⏱️  Time: {duration:.1f}s")
+            print("💡 Check quota: run 'claude' then type '/usage'")
+            print(f"{'─'*60}\n")
+
+        # Get summary from Claude's actual response
+        if success:
+            # Use the last message from conversation_history (Claude's final response)
+            if conversation_history:
+                summary = conversation_history[-1]  # Last message is the most recent
+            else:
+                # Fallback to git log if no conversation captured
+                _, log_output = self.run_cmd((*GIT_LOG_ONELINE, f"{self.base_branch}..HEAD"))
+                summary = f"Changes made:\n{log_output}" if log_output.strip() else "Claude completed"
+        else:
+            summary = "Claude failed"
 
-        except FileNotFoundError:
-            return False, "Claude CLI not found"
-        except OSError as e:
-            return False, f"Failed to run Claude: {e}"
+        return success, summary
 
     def run_codex(self, prompt: str, timeout: int = 3600) -> tuple[bool, str]:
         """Run Codex CLI with the given prompt."""
@@ -1692,30 +2608,33 @@ Provide a clear, direct answer that Claude can use. Be concise but thorough."""
                     stdin=stdin_source,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
-                    text=True,
+                    close_fds=False,
                 )
 
-                output_lines = []
-                start_time = time.time()
-
-                while True:
-                    if time.time() - start_time > timeout:
-                        process.kill()
-                        return False, "Codex timed out"
+                # Only the tail is used for the summary, so keep memory bounded
+                output_lines: deque[str] = deque(maxlen=50)
+                deadline = time.monotonic() + timeout
 
-                    line = process.stdout.readline()
-                    if not line:
-                        if process.poll() is not None:
-                            break
-                        time.sleep(0.01)
-                        continue
-
-                    # Print and capture output
-                    print(line, end="", flush=True)
-                    output_lines.append(line)
-
-                success = process.returncode == 0
-                summary = "".join(output_lines[-50:]) if output_lines else "Codex completed"
+                with process.stdout:
+                    reader = LineReader(process.stdout)
+                    try:
+                        while True:
+                            line = reader.readline(deadline - time.monotonic())
+                            if line is None:
+                                process.kill()
+                                process.wait()
+                                return False, "Codex timed out"
+                            if not line:
+                                break
+
+                            # Print and capture output
+                            print(line, end="", flush=True)
+                            output_lines.append(line)
+                    finally:
+                        reader.close()
+
+                success = process.wait() == 0
+                summary = "".join(output_lines) if output_lines else "Codex completed"
 
                 return success, summary
 
@@ -1735,6 +2654,26 @@ Provide a clear, direct answer that Claude can use. Be concise but thorough."""
         except OSError as e:
             return False, f"Failed to run Codex: {e}"
 
+    def run_review_prompt(self, timeout: int = 3600) -> tuple[bool, str]:
+        """Run the review prompt, one mode per Claude call when sequential_modes is set.
+
+        Every mode runs even if earlier ones changed nothing, since the modes
+        look for unrelated things. timeout covers all modes.
+        """
+        mode_prompts = iter_mode_prompts(self.modes) if self.sequential_modes and not self.custom_prompt else []
+        if len(mode_prompts) < 2:
+            return self.run_claude(self.review_prompt, timeout)
+
+        deadline = time.monotonic() + timeout
+        summaries = []
+        for name, prompt in mode_prompts:
+            self.log(f"Running mode: {name}")
+            success, summary = self.run_claude(prompt, timeout=max(1, int(deadline - time.monotonic())))
+            if not success:
+                return False, summary
+            summaries.append(f"{name}: {summary}")
+        return True, "\n\n".join(summaries)
+
     def run_tool(self, prompt: str, timeout: int = 3600) -> tuple[bool, str]:
         """Run the configured coding tool (claude or codex) with the given prompt."""
         if self.tool == "codex":
@@ -1745,14 +2684,13 @@ Provide a clear, direct answer that Claude can use. Be concise but thorough."""
     def generate_branch_name(self) -> str:
         """Generate a unique branch name based on mode and timestamp."""
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        suffix = ''.join(random.choices(string.ascii_lowercase, k=4))
-        mode_prefix = self.modes[0].replace("_", "-") if self.modes else "review"
-        return f"auto-{mode_prefix}/{timestamp}-{suffix}"
+        suffix = secrets.token_hex(3)
+        return f"auto-{self._mode_prefix}/{timestamp}-{suffix}"
 
     def create_branch(self, branch_name: str) -> bool:
         """Create a new branch from base_branch and check it out."""
-        self.run_cmd(["git", "checkout", self.base_branch])
-        self.run_cmd(["git", "pull", "--rebase"])
+        self.run_cmd((*GIT_CHECKOUT, self.base_branch))
+        self.run_cmd(GIT_PULL_REBASE)
         success, output = self.run_cmd(["git", "checkout", "-b", branch_name])
         if success:
             self.current_branch = branch_name
@@ -1761,12 +2699,29 @@ Provide a clear, direct answer that Claude can use. Be concise but thorough."""
 
     def has_commits_ahead(self) -> bool:
         """Check if current branch has commits ahead of base branch."""
-        success, output = self.run_cmd(["git", "rev-list", "--count", f"{self.base_branch}..HEAD"])
+        # Only "any?" matters, so stop the walk at the first commit
+        output = self.git_query(("git", "rev-list", "--count", "--max-count=1", f"{self.base_branch}..HEAD"))
         try:
-            return success and int(output.strip()) > 0
+            return output is not None and int(output) > 0
         except ValueError:
             return False
 
+    def has_changes(self) -> bool:
+        """Check if the working tree has uncommitted changes."""
+        return bool(self.git_query(("git", "status", "--porcelain")))
+
+    def work_status(self) -> tuple[bool, bool]:
+        """Return (has_commits_ahead, has_changes), running both read-only git checks concurrently."""
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            ahead = pool.submit(self.has_commits_ahead)
+            dirty = pool.submit(self.has_changes)
+            return ahead.result(), dirty.result()
+
+    def get_branch_diff(self) -> str | None:
+        """Get the diff of the current branch against base_branch, or None on failure."""
+        success, output = self.run_cmd(["git", "diff", f"{self.base_branch}...HEAD"], timeout=120)
+        return output if success else None
+
     def create_pull_request(self, summary: str) -> str | None:
         if not self.has_commits_ahead():
             return None
@@ -1778,36 +2733,70 @@ Provide a clear, direct answer that Claude can use. Be concise but thorough."""
         pr_title = f"Auto-improvement: {mode_names} ({datetime.now().strftime('%Y-%m-%d')})"
         pr_body = f"## Automated Code Improvement\n\n### Modes: {mode_names}\n\n### Summary\n{summary[:3000]}"
 
+        # gh is only a fallback for an unreachable API: after GitHub has answered
+        # (or may have acted), running gh too could open a second PR
+        if self.github.available:
+            try:
+                pr_url = self.github.create_pull(pr_title, pr_body, self.current_branch, self.base_branch)
+            except GitHubUnreachable as e:
+                self.log(f"GitHub API unreachable, falling back to gh CLI: {e}")
+            except (http.client.HTTPException, OSError) as e:
+                self.log(f"GitHub API error after sending the PR request: {e}")
+                return None
+            else:
+                if pr_url:
+                    self.log(f"Created PR: {pr_url}")
+                else:
+                    self.log("GitHub API refused to create the PR")
+                return pr_url
+
         success, output = self.run_cmd(["gh", "pr", "create", "--title", pr_title, "--body", pr_body, "--base", self.base_branch], timeout=60)
         if not success:
             return None
 
-        for line in output.strip().split('\n'):
-            if 'github.com' in line and '/pull/' in line:
-                self.log(f"Created PR: {line.strip()}")
-                return line.strip()
-        return None
+        match = _PR_URL_RE.search(output)
+        if not match:
+            return None
+        self.log(f"Created PR: {match.group()}")
+        return match.group()
+
+    @staticmethod
+    def _pr_number(pr_url: str) -> str:
+        """Extract the PR number from a pull request URL."""
+        match = _PR_NUMBER_RE.search(pr_url)
+        return match.group(1) if match else pr_url.rstrip('/').split('/')[-1]
 
     def review_pr_with_claude(self, pr_url: str) -> tuple[bool, str, str]:
-        pr_number = pr_url.rstrip('/').split('/')[-1]
+        pr_number = self._pr_number(pr_url)
         success, output = self.run_claude(get_pr_review_prompt(pr_number), timeout=600)
         output_lower = output.lower()
         approved = ("approved" in output_lower or "lgtm" in output_lower) and "changes_requested" not in output_lower
-        match = re.search(r'CHANGES_REQUESTED[:\s]*(.+)', output, re.DOTALL | re.IGNORECASE)
+        match = _CHANGES_REQUESTED_RE.search(output)
         feedback = match.group(1).strip()[:1000] if match else '\n'.join(output.strip().split('\n')[-20:])
         return approved, output, feedback
 
     def fix_pr_feedback(self, pr_url: str, feedback: str, iteration: int) -> tuple[bool, str]:
-        pr_number = pr_url.rstrip('/').split('/')[-1]
+        pr_number = self._pr_number(pr_url)
         return self.run_claude(get_fix_feedback_prompt(pr_number, feedback), timeout=1200)
 
     def merge_pr(self, pr_url: str) -> bool:
-        pr_number = pr_url.rstrip('/').split('/')[-1]
+        pr_number = self._pr_number(pr_url)
         branch_to_delete = self.current_branch
-        success, _ = self.run_cmd(["gh", "pr", "merge", pr_number, "--squash", "--delete-branch"], timeout=60)
+        success = False
+        use_gh = not self.github.available
+        if self.github.available:
+            try:
+                success = self.github.merge_pull(pr_number, delete_branch=branch_to_delete)
+            except GitHubUnreachable as e:
+                self.log(f"GitHub API unreachable, falling back to gh CLI: {e}")
+                use_gh = True
+            except (http.client.HTTPException, OSError) as e:
+                self.log(f"GitHub API error after sending the merge request: {e}")
+        if use_gh:
+            success, _ = self.run_cmd(["gh", "pr", "merge", pr_number, "--squash", "--delete-branch"], timeout=60)
         if success and branch_to_delete:
             # Switch to base branch and delete local branch
-            self.run_cmd(["git", "checkout", self.base_branch])
+            self.run_cmd((*GIT_CHECKOUT, self.base_branch))
             self.run_cmd(["git", "branch", "-D", branch_to_delete])
             self.current_branch = None
             self.log(f"Deleted branch: {branch_to_delete}")
@@ -1815,91 +2804,97 @@ Provide a clear, direct answer that Claude can use. Be concise but thorough."""
 
     def cleanup_branch(self):
         if self.current_branch:
-            self.run_cmd(["git", "checkout", self.base_branch])
+            self.run_cmd((*GIT_CHECKOUT, self.base_branch))
             self.current_branch = None
 
-    def run_once(self) -> bool:
-        # Check for stale lock file and prompt to remove
-        if self.lock_file.path.exists():
-            self.log(f"Found stale lock file: {self.lock_file.path}")
-            print(f"\n⚠️  Found stale lock file: {self.lock_file.path}")
+    def current_revision(self) -> str | None:
+        """Commit a run would start from: origin/<base> in PR mode, else the work branch or HEAD."""
+        if self.create_pr:
+            self.run_cmd(["git", "fetch", "origin", self.base_branch], timeout=120)
+            return self.git_query(("git", "rev-parse", f"origin/{self.base_branch}"))
+        return self.git_query(("git", "rev-parse", self.work_branch or "HEAD"))
 
-            if self.auto_yes:
-                # Auto-remove with --yes flag
-                try:
-                    self.lock_file.path.unlink()
-                    self.log("Lock file removed (auto-yes)")
-                    print("Lock file removed (auto-yes)")
-                except OSError as e:
-                    self.log(f"Failed to remove lock file: {e}")
-                    return False
-            else:
-                # Prompt user
-                try:
-                    response = input("Remove lock file and continue? [y/N]: ").strip().lower()
-                    if response in ('y', 'yes'):
-                        try:
-                            self.lock_file.path.unlink()
-                            self.log("Lock file removed")
-                        except OSError as e:
-                            self.log(f"Failed to remove lock file: {e}")
-                            return False
-                    else:
-                        self.log("Skipping")
-                        return False
-                except (EOFError, KeyboardInterrupt):
-                    print("\nAborted")
-                    return False
+    def load_last_revision(self) -> str | None:
+        """Read the commit recorded by the last successful run, if any."""
+        try:
+            return self.last_run_file.read_text().strip() or None
+        except OSError:
+            return None
 
+    def save_last_revision(self, revision: str) -> None:
+        """Record a commit as processed, replacing the marker atomically."""
+        tmp_path = self.last_run_file.with_name(f"{self.last_run_file.name}.tmp")
+        try:
+            tmp_path.write_text(revision + "\n")
+            os.replace(tmp_path, self.last_run_file)
+        except OSError as e:
+            self.log(f"Failed to record last run: {e}")
+
+    def run_once(self) -> bool:
         if not self.lock_file.acquire():
-            self.log("Another review is already running, skipping")
+            owner = self.lock_file.owner_pid()
+            self.log(f"Another review is already running (PID {owner}), skipping")
             return False
 
         try:
-            self.log("=" * 60)
-            self.log("Starting review cycle")
-
-            # Checkout to work branch if specified
-            if self.work_branch:
-                _, current = self.run_cmd(["git", "rev-parse", "--abbrev-ref", "HEAD"])
-                current = current.strip()
-                if current != self.work_branch:
-                    self.log(f"Checking out to {self.work_branch}...")
-                    success, _ = self.run_cmd(["git", "checkout", self.work_branch])
-                    if not success:
-                        # Try to create the branch if it doesn't exist
-                        success, _ = self.run_cmd(["git", "checkout", "-b", self.work_branch])
-                        if not success:
-                            self.log(f"Failed to checkout to {self.work_branch}")
-                            self.telegram.send(f"⚠️ *Auto-Review Failed*\n\nCould not checkout to {self.work_branch}.")
-                            return False
-                else:
-                    self.log(f"Already on {self.work_branch}")
-
-            # Default: just run on the current branch without creating a new one
-            if not self.create_pr:
-                self.log("Running in no-PR mode (commits only)...")
-
-                # Use AI consultant's goal if available (replaces original prompt)
-                if self.gemini_feedback:
-                    prompt = self.gemini_feedback
-                    self.log(f"Using AI-generated goal: {self.gemini_feedback[:200]}...")
-                    # Clear feedback after using it
-                    self.gemini_feedback = None
-                else:
-                    prompt = self.review_prompt
+            # With --skip-unchanged, skip the whole cycle when nothing changed since the last one
+            revision = self.current_revision() if self.skip_unchanged else None
+            if revision is not None and revision == self.load_last_revision():
+                self.log(f"No new commits since last run ({revision[:12]}), skipping")
+                return True
 
-                success, summary = self.run_claude(prompt, timeout=3600)
+            with self.telegram.cycle():
+                result = self.run_cycle()
+            # Record where this cycle started, so its own commits count as changes next time
+            if result and revision is not None:
+                self.save_last_revision(revision)
+            return result
+        finally:
+            self.lock_file.release()
+
+    def run_cycle(self) -> bool:
+        """Run one improvement cycle; run_once wraps this with locking."""
+        self.log("=" * 60)
+        self.log("Starting review cycle")
+
+        # Checkout to work branch if specified
+        if self.work_branch:
+            current = self.git_query(GIT_CURRENT_BRANCH)
+            if current != self.work_branch:
+                self.log(f"Checking out to {self.work_branch}...")
+                success, _ = self.run_cmd((*GIT_CHECKOUT, self.work_branch))
                 if not success:
-                    self.telegram.send("⚠️ *Auto-Review Failed*\n\nClaude failed.")
-                    return False
+                    # Try to create the branch if it doesn't exist
+                    success, _ = self.run_cmd(["git", "checkout", "-b", self.work_branch])
+                    if not success:
+                        self.log(f"Failed to checkout to {self.work_branch}")
+                        self.telegram.send(_TG_FAILED.format(reason=f"Could not checkout to {tg_escape(self.work_branch)}."))
+                        return False
+            else:
+                self.log(f"Already on {self.work_branch}")
+
+        # Default: just run on the current branch without creating a new one
+        if not self.create_pr:
+            self.log("Running in no-PR mode (commits only)...")
+
+            # Use AI consultant's goal if available (replaces original prompt)
+            if self.gemini_feedback:
+                prompt = self.gemini_feedback
+                self.log(f"Using AI-generated goal: {self.gemini_feedback[:200]}...")
+                # Clear feedback after using it
+                self.gemini_feedback = None
+                success, summary = self.run_claude(prompt, timeout=3600)
+            else:
+                success, summary = self.run_review_prompt(timeout=3600)
+            if not success:
+                self.telegram.send(_TG_FAILED.format(reason="Claude failed."))
+                return False
 
-                # Check what commits were made
-                _, log_output = self.run_cmd(["git", "log", "--oneline", "-10"])
-                _, diff_stat = self.run_cmd(["git", "diff", "--stat", "HEAD~3..HEAD"])
+            # Check what commits were made
+            (_, log_output), (_, diff_stat) = self.run_cmds((GIT_RECENT_LOG, GIT_RECENT_DIFF_STAT))
 
-                # Prepare context for Gemini review
-                gemini_context = f"""Project: {self.project_dir}
+            # Prepare context for Gemini review
+            gemini_context = f"""Project: {self.project_dir}
 Goal/Task: {self.review_prompt[:500]}
 
 Claude's Summary:
@@ -1911,13 +2906,13 @@ Recent Commits:
 Changes:
 {diff_stat.strip() if diff_stat.strip() else 'No changes'}"""
 
-                # Ask AI consultant to review what Claude did and set next goal
-                if self.use_ai:
-                    ai_name = self.ai_model if self.ai_model != "auto" else "AI"
-                    print(f"\n\033[95m🔮 Asking {ai_name} to review Claude's work and set next goal...\033[0m")
-                    self.telegram.send(f"🔮 *{ai_name} reviewing Claude's work...*")
+            # Ask AI consultant to review what Claude did and set next goal
+            if self.use_ai:
+                ai_name = self.ai_model if self.ai_model != "auto" else "AI"
+                print(f"\n\033[95m🔮 Asking {ai_name} to review Claude's work and set next goal...\033[0m")
+                self.telegram.send(f"🔮 *{ai_name} reviewing Claude's work...*")
 
-                    gemini_question = """Review what Claude just accomplished and determine the next goal.
+                gemini_question = """Review what Claude just accomplished and determine the next goal.
 
 IMPORTANT:
 - If Claude stated "Goal achieved!" in the summary, trust that assessment
@@ -1936,144 +2931,164 @@ NEXT_GOAL:
 (If CONTINUE is YES, write a complete goal/prompt here. If CONTINUE is NO, write "N/A")
 """
 
-                    gemini_feedback = self.ask_ai(gemini_question, gemini_context)
-
-                    if gemini_feedback:
-                        print(f"\n\033[92m✨ {ai_name}'s Review:\033[0m\n{gemini_feedback}\n")
-                        self.telegram.send(f"✨ *{ai_name}'s Review:*\n{gemini_feedback[:500]}")
-
-                        # Parse the key-value format
-                        goal_achieved = False
-                        should_continue = True
-                        next_goal = None
-
-                        lines = gemini_feedback.split('\n')
-                        in_goal_section = False
-                        goal_lines = []
-
-                        for line in lines:
-                            line_stripped = line.strip()
-
-                            if line_stripped.startswith('GOAL_ACHIEVED:'):
-                                value = line_stripped.split(':', 1)[1].strip().upper()
-                                goal_achieved = 'YES' in value
-                                in_goal_section = False
-                            elif line_stripped.startswith('CONTINUE:'):
-                                value = line_stripped.split(':', 1)[1].strip().upper()
-                                should_continue = 'YES' in value
-                                in_goal_section = False
-                            elif line_stripped.startswith('NEXT_GOAL:'):
-                                in_goal_section = True
-                                # Check if goal is on the same line
-                                rest = line_stripped.split(':', 1)[1].strip()
-                                if rest and rest.upper() != 'N/A':
-                                    goal_lines.append(rest)
-                            elif in_goal_section:
-                                # Collect all lines after NEXT_GOAL:
-                                if line_stripped and line_stripped.upper() != 'N/A':
-                                    goal_lines.append(line)
-
-                        if goal_lines:
-                            next_goal = '\n'.join(goal_lines).strip()
-                            if next_goal.upper() == 'N/A':
-                                next_goal = None
-
-                        # Check if goal is achieved
-                        if goal_achieved:
-                            self.log(f"{ai_name} confirmed goal achieved")
-                            self.telegram.send(f"✅ *Goal Achieved!*\n\n{ai_name} confirmed the task is complete.")
-                            return "completed"
-
-                        # Check if we should stop
-                        if not should_continue:
-                            self.log("AI consultant says to stop")
-                            self.telegram.send("✅ *AI says stop*\n\nNo more work needed.")
-                            return "completed"
-
-                        # Store next goal for next iteration if we should continue
-                        if should_continue and next_goal:
-                            self.gemini_feedback = next_goal
-                            self.log(f"AI consultant set next goal: {next_goal[:100]}...")
-                            print(f"\n\033[96m📋 Next goal set by AI:\033[0m\n{next_goal[:300]}{'...' if len(next_goal) > 300 else ''}\n")
-                    else:
-                        print(f"\n\033[91m⚠️ {ai_name} failed to provide feedback\033[0m")
-                        self.telegram.send(f"⚠️ *{ai_name} failed to provide feedback*")
-
-                # Check if Claude indicated the goal/task is complete (always check, regardless of commits)
-                # Strip markdown formatting for more reliable detection
-                summary_clean = summary.replace('*', '').replace('_', '')
-                if "goal achieved" in summary_clean.lower() or "north star achieved" in summary_clean.lower():
-                    self.log("Goal completed - no more work needed")
-                    self.telegram.send("✅ *Auto-Review Complete*\n\nGoal achieved, no more work needed.")
-                    print("\n\033[92m✓ Goal achieved! Loop will exit.\033[0m")
-                    return "completed"  # Special return to signal loop exit
-
-                # Fallback to original logic if no AI or for backwards compatibility
-                if log_output.strip():
-                    self.log(f"Recent commits:\n{log_output}")
-                    self.telegram.send("✅ *Auto-Review Complete*\n\nCommits made on current branch.")
+                gemini_feedback = self.ask_ai(gemini_question, gemini_context)
+
+                if gemini_feedback:
+                    print(f"\n\033[92m✨ {ai_name}'s Review:\033[0m\n{gemini_feedback}\n")
+                    self.telegram.send(f"✨ *{ai_name}'s Review:*\n{tg_escape(gemini_feedback[:500])}")
+
+                    # Parse the key-value format
+                    goal_achieved = False
+                    should_continue = True
+                    next_goal = None
+
+                    lines = gemini_feedback.split('\n')
+                    in_goal_section = False
+                    goal_lines = []
+
+                    for line in lines:
+                        line_stripped = line.strip()
+
+                        if line_stripped.startswith('GOAL_ACHIEVED:'):
+                            value = line_stripped.split(':', 1)[1].strip().upper()
+                            goal_achieved = 'YES' in value
+                            in_goal_section = False
+                        elif line_stripped.startswith('CONTINUE:'):
+                            value = line_stripped.split(':', 1)[1].strip().upper()
+                            should_continue = 'YES' in value
+                            in_goal_section = False
+                        elif line_stripped.startswith('NEXT_GOAL:'):
+                            in_goal_section = True
+                            # Check if goal is on the same line
+                            rest = line_stripped.split(':', 1)[1].strip()
+                            if rest and rest.upper() != 'N/A':
+                                goal_lines.append(rest)
+                        elif in_goal_section:
+                            # Collect all lines after NEXT_GOAL:
+                            if line_stripped and line_stripped.upper() != 'N/A':
+                                goal_lines.append(line)
+
+                    if goal_lines:
+                        next_goal = '\n'.join(goal_lines).strip()
+                        if next_goal.upper() == 'N/A':
+                            next_goal = None
+
+                    # Check if goal is achieved
+                    if goal_achieved:
+                        self.log(f"{ai_name} confirmed goal achieved")
+                        self.telegram.send(f"✅ *Goal Achieved!*\n\n{ai_name} confirmed the task is complete.")
+                        return "completed"
+
+                    # Check if we should stop
+                    if not should_continue:
+                        self.log("AI consultant says to stop")
+                        self.telegram.send("✅ *AI says stop*\n\nNo more work needed.")
+                        return "completed"
+
+                    # Store next goal for next iteration if we should continue
+                    if should_continue and next_goal:
+                        self.gemini_feedback = next_goal
+                        self.log(f"AI consultant set next goal: {next_goal[:100]}...")
+                        print(f"\n\033[96m📋 Next goal set by AI:\033[0m\n{next_goal[:300]}{'...' if len(next_goal) > 300 else ''}\n")
                 else:
-                    self.log("No changes made")
-                    self.telegram.send("✅ *Auto-Review Complete*\n\nNo changes needed.")
+                    print(f"\n\033[91m⚠️ {ai_name} failed to provide feedback\033[0m")
+                    self.telegram.send(f"⚠️ *{ai_name} failed to provide feedback*")
+
+            # Check if Claude indicated the goal/task is complete (always check, regardless of commits)
+            # Strip markdown formatting for more reliable detection
+            summary_clean = summary.replace('*', '').replace('_', '')
+            if "goal achieved" in summary_clean.lower() or "north star achieved" in summary_clean.lower():
+                self.log("Goal completed - no more work needed")
+                self.telegram.send(_TG_COMPLETE.format(detail="Goal achieved, no more work needed."))
+                print("\n\033[92m✓ Goal achieved! Loop will exit.\033[0m")
+                return "completed"  # Special return to signal loop exit
+
+            # Fallback to original logic if no AI or for backwards compatibility
+            if log_output.strip():
+                self.log(f"Recent commits:\n{log_output}")
+                self.telegram.send(_TG_COMPLETE.format(detail="Commits made on current branch."))
+            else:
+                self.log("No changes made")
+                self.telegram.send(_TG_COMPLETE.format(detail="No changes needed."))
 
-                self.log("Review cycle complete")
-                self.log("=" * 60)
-                return True
+            self.log("Review cycle complete")
+            self.log("=" * 60)
+            return True
 
-            branch_name = self.generate_branch_name()
-            if not self.create_branch(branch_name):
-                self.telegram.send("⚠️ *Auto-Review Failed*\n\nCould not create branch.")
-                return False
+        branch_name = self.generate_branch_name()
+        if not self.create_branch(branch_name):
+            self.telegram.send(_TG_FAILED.format(reason="Could not create branch."))
+            return False
 
-            self.log("Running Claude...")
-            success, summary = self.run_claude(self.review_prompt, timeout=3600)
-            if not success:
-                self.cleanup_branch()
-                self.telegram.send("⚠️ *Auto-Review Failed*\n\nClaude failed.")
-                return False
+        self.log("Running Claude...")
+        success, summary = self.run_review_prompt(timeout=3600)
+        if not success:
+            self.cleanup_branch()
+            self.telegram.send(_TG_FAILED.format(reason="Claude failed."))
+            return False
 
-            if not self.has_commits_ahead():
-                self.log("No changes made")
-                self.cleanup_branch()
-                self.telegram.send("✅ *Auto-Review Complete*\n\nNo changes needed.")
-                return True
+        commits_ahead, uncommitted = self.work_status()
+        if not commits_ahead:
+            if uncommitted:
+                self.log("Warning: Claude left uncommitted changes without committing them")
+            self.log("No changes made")
+            self.cleanup_branch()
+            self.telegram.send(_TG_COMPLETE.format(detail="No changes needed."))
+            return True
 
-            pr_url = self.create_pull_request(summary)
-            if not pr_url:
-                self.cleanup_branch()
-                self.telegram.send("⚠️ *Auto-Review Failed*\n\nCould not create PR.")
-                return False
+        pr_url = self.create_pull_request(summary)
+        if not pr_url:
+            self.cleanup_branch()
+            self.telegram.send(_TG_FAILED.format(reason="Could not create PR."))
+            return False
 
-            # Review-fix loop
-            for iteration in range(1, self.max_iterations + 1):
-                self.log(f"Review iteration {iteration}/{self.max_iterations}")
-                approved, _, feedback = self.review_pr_with_claude(pr_url)
-
-                if approved:
-                    self.log(f"PR approved on iteration {iteration}")
-                    if self.auto_merge:
-                        self.merge_pr(pr_url)
-                        self.telegram.send(f"✅ *Auto-Review Merged*\n🔗 {pr_url}")
-                    else:
-                        self.telegram.send(f"✅ *Auto-Review: PR Ready*\n🔗 {pr_url}")
-                    break
+        # Review-fix loop
+        seen_rounds: set[bytes] = set()  # Hashes of (diff, feedback) already sent to the fixer
+        for iteration in range(1, self.max_iterations + 1):
+            self.log(f"Review iteration {iteration}/{self.max_iterations}")
+            approved, _, feedback = self.review_pr_with_claude(pr_url)
+
+            if approved:
+                self.log(f"PR approved on iteration {iteration}")
+                if self.auto_merge:
+                    self.merge_pr(pr_url)
+                    self.telegram.send(f"✅ *Auto-Review Merged*\n🔗 {tg_escape(pr_url)}")
+                else:
+                    self.telegram.send(f"✅ *Auto-Review: PR Ready*\n🔗 {tg_escape(pr_url)}")
+                break
 
-                self.log("Changes requested, fixing...")
-                self.telegram.send(f"🔄 Fixing feedback (iteration {iteration})")
-                fix_success, _ = self.fix_pr_feedback(pr_url, feedback, iteration)
-                if not fix_success:
-                    self.telegram.send(f"⚠️ *Fixer Failed*\n🔗 {pr_url}")
+            # Stop if the fixer would get the same diff and feedback again
+            diff = self.get_branch_diff()
+            if diff is not None:
+                round_hash = hashlib.blake2b(
+                    f"{diff}\0{feedback}".encode("utf-8"), digest_size=16
+                ).digest()
+                if round_hash in seen_rounds:
+                    self.log("No progress: same diff and feedback as an earlier iteration, stopping")
+                    self.telegram.send(f"⚠️ *No progress on review feedback*\n🔗 {tg_escape(pr_url)}")
                     break
-            else:
-                self.telegram.send(f"⚠️ *Max iterations reached*\n🔗 {pr_url}")
+                seen_rounds.add(round_hash)
+
+            self.log("Changes requested, fixing...")
+            self.telegram.send(f"🔄 Fixing feedback (iteration {iteration})")
+            head_before = self.git_query(GIT_HEAD)
+            fix_success, _ = self.fix_pr_feedback(pr_url, feedback, iteration)
+            if not fix_success:
+                self.telegram.send(f"⚠️ *Fixer Failed*\n🔗 {tg_escape(pr_url)}")
+                break
 
-            self.cleanup_branch()
-            self.log("Review cycle complete")
-            self.log("=" * 60)
-            return True
+            # A fixer run without a new commit would only get the same review again
+            if head_before is not None and self.git_query(GIT_HEAD) == head_before:
+                self.log("Fixer made no changes, stopping")
+                self.telegram.send(f"⚠️ *No progress on review feedback*\n🔗 {tg_escape(pr_url)}")
+                break
+        else:
+            self.telegram.send(f"⚠️ *Max iterations reached*\n🔗 {tg_escape(pr_url)}")
 
-        finally:
-            self.lock_file.release()
+        self.cleanup_branch()
+        self.log("Review cycle complete")
+        self.log("=" * 60)
+        return True
 
 # ============================================================================
 # SCHEDULING
@@ -2118,15 +3133,53 @@ def run_loop(reviewer: AutoReviewer, until_finish: bool = False):
             print(f"\nRun #{run_count} complete (took {duration:.1f}s). Starting next run immediately...")
 
 
+_WAKE_SIGNALS = {signal.SIGINT, signal.SIGTERM, signal.SIGHUP}
+
+
+def sleep_until(deadline: float) -> None:
+    """Sleep until a time.monotonic() deadline, waking at once on SIGINT/SIGTERM/SIGHUP.
+
+    Where available, the wake-up signals are blocked only for the duration of
+    the wait and collected with sigtimedwait, then re-raised so their usual
+    handlers run (KeyboardInterrupt for SIGINT, termination for SIGTERM).
+    Otherwise, or off the main thread, this falls back to time.sleep.
+    """
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return
+    if not hasattr(signal, "sigtimedwait") or threading.current_thread() is not threading.main_thread():
+        time.sleep(remaining)
+        return
+
+    info = None
+    previous = signal.pthread_sigmask(signal.SIG_BLOCK, _WAKE_SIGNALS)
+    try:
+        while info is None and (remaining := deadline - time.monotonic()) > 0:
+            info = signal.sigtimedwait(_WAKE_SIGNALS, remaining)
+    finally:
+        signal.pthread_sigmask(signal.SIG_SETMASK, previous)
+    if info is not None:
+        signal.raise_signal(info.si_signo)
+
+
 def run_with_interval(reviewer: AutoReviewer, interval: int):
+    """Run a cycle every `interval` seconds on a fixed monotonic schedule.
+
+    Runs start on a grid of start + k * interval, so sleep jitter never
+    accumulates. After a run the next one waits for the first grid slot not
+    yet passed; slots a long run overran are skipped rather than replayed.
+    """
     print(f"Running every {interval}s. Press Ctrl+C to stop.")
+    start = slot = time.monotonic()
     while True:
-        start = time.time()
         reviewer.run_once()
-        sleep_time = max(0, interval - (time.time() - start))
-        if sleep_time > 0:
-            print(f"\nWaiting {int(sleep_time)}s before next run...")
-            time.sleep(sleep_time)
+        now = time.monotonic()
+        if now - slot > interval:
+            print(f"\nRun took longer than {interval}s; skipping to the next slot")
+        slot = start + math.ceil((now - start) / interval) * interval
+        if slot > now:
+            print(f"\nWaiting {int(slot - now)}s before next run...")
+            sleep_until(slot)
 
 
 def run_with_cron(reviewer: AutoReviewer, cron_expr: str):
@@ -2140,22 +3193,105 @@ def run_with_cron(reviewer: AutoReviewer, cron_expr: str):
         wait = (next_run - datetime.now()).total_seconds()
         if wait > 0:
             print(f"Next run at {next_run}")
-            time.sleep(wait)
+            sleep_until(time.monotonic() + wait)
         reviewer.run_once()
 
+
+# Scheduling flags that are replaced by --once when running under a systemd timer
+_RESIDENT_FLAGS = frozenset({"--once", "--loop", "--loop-until-finish", "--emit-systemd-units", "--install"})
+_RESIDENT_OPTIONS = frozenset({"--interval", "--cron"})
+
+
+def _systemd_escape(value: str) -> str:
+    """Escape % specifiers and $VAR expansion so systemd passes the value through literally."""
+    return value.replace("%", "%%").replace("$", "$$")
+
+
+def systemd_unit_files(project_dir: Path, interval: int, cli_args: list[str]) -> dict[str, str]:
+    """Build a .service/.timer pair that runs one review cycle every `interval` seconds.
+
+    cli_args are the original command-line arguments; scheduling flags are
+    stripped and replaced with --once -y so each timer activation runs one
+    non-interactive cycle and exits.
+
+    Returns:
+        Mapping of unit file name to unit file contents.
+    """
+    forwarded = []
+    skip_value = False
+    for arg in cli_args:
+        if skip_value:
+            skip_value = False
+            continue
+        name = arg.split("=", 1)[0]
+        if name in _RESIDENT_OPTIONS:
+            skip_value = "=" not in arg
+            continue
+        if arg not in _RESIDENT_FLAGS:
+            forwarded.append(arg)
+    if "-y" not in forwarded and "--yes" not in forwarded:
+        forwarded.append("-y")
+
+    exec_start = " ".join(
+        _systemd_escape(shlex.quote(arg))
+        for arg in [sys.executable, "-m", "let_claude_code", "--once", *forwarded]
+    )
+    unit = "cook-" + (re.sub(r"[^A-Za-z0-9_.-]", "-", project_dir.name) or "project")
+    # Description= and WorkingDirectory= expand specifiers but not variables
+    project = str(project_dir).replace("%", "%%")
+    service = f"""[Unit]
+Description=let-claude-code review cycle for {project}
+
+[Service]
+Type=oneshot
+WorkingDirectory={project}
+ExecStart={exec_start}
+"""
+    timer = f"""[Unit]
+Description=Run {unit}.service every {interval}s
+
+[Timer]
+OnActiveSec=0
+OnUnitActiveSec={interval}s
+Unit={unit}.service
+
+[Install]
+WantedBy=timers.target
+"""
+    return {f"{unit}.service": service, f"{unit}.timer": timer}
+
+
+def emit_systemd_units(project_dir: Path, interval: int, cli_args: list[str],
+                       unit_dir: Path | None = None, install: bool = False) -> tuple[bool, str]:
+    """Write the systemd user units for this project and optionally enable the timer."""
+    unit_dir = unit_dir or Path.home() / ".config" / "systemd" / "user"
+    units = systemd_unit_files(project_dir, interval, cli_args)
+    try:
+        unit_dir.mkdir(parents=True, exist_ok=True)
+        for name, content in units.items():
+            (unit_dir / name).write_text(content)
+    except OSError as e:
+        return False, f"Failed to write systemd units: {e}"
+
+    timer = next(name for name in units if name.endswith(".timer"))
+    written = ", ".join(str(unit_dir / name) for name in units)
+    if not install:
+        return True, f"Wrote {written}\nEnable with: systemctl --user daemon-reload && systemctl --user enable --now {timer}"
+
+    for cmd in (["systemctl", "--user", "daemon-reload"], ["systemctl", "--user", "enable", "--now", timer]):
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            return False, f"Wrote {written}\nFailed to run {' '.join(cmd)}: {e}"
+        if result.returncode != 0:
+            return False, f"Wrote {written}\n{' '.join(cmd)} failed: {result.stderr.strip()}"
+    return True, f"Wrote {written}\nEnabled {timer}"
+
 # ============================================================================
 # CLI
 # ============================================================================
 
 def main():
-    # Load environment variables from .env file
-    try:
-        from dotenv import load_dotenv
-        load_dotenv(dotenv_path=os.path.join(os.getcwd(), ".env"), override=False)
-    except ImportError:
-        # python-dotenv not installed, skip loading .env file
-        pass
-
     parser = argparse.ArgumentParser(
         description="Claude Automator - Automatically improve your codebase",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -2166,15 +3302,25 @@ def main():
     parser.add_argument("--loop-until-finish", action="store_true", help="Loop until Gemini/Claude determines task is complete")
     parser.add_argument("--interval", type=int, help="Run every N seconds")
     parser.add_argument("--cron", type=str, help="Cron expression")
+    parser.add_argument("--emit-systemd-units", action="store_true",
+                        help="Write a systemd user timer running --once every --interval seconds, then exit")
+    parser.add_argument("--install", action="store_true",
+                        help="With --emit-systemd-units, also enable and start the timer")
+    parser.add_argument("--skip-unchanged", action="store_true",
+                        help="Skip the run if nothing changed since the start of the last successful one")
     parser.add_argument("--mode", "-m", type=str, action="append", dest="modes", help="Improvement mode")
+    parser.add_argument("--sequential-modes", action="store_true",
+                        help="Run each mode as its own Claude call instead of one combined prompt")
     parser.add_argument("--northstar", "-n", action="store_true", help="Use NORTHSTAR.md")
     parser.add_argument("--init-northstar", action="store_true", help="Create NORTHSTAR.md template")
     parser.add_argument("--goal", "-g", type=str, help="Work towards a specific goal")
     parser.add_argument("--list-modes", action="store_true", help="List modes")
     parser.add_argument("--auto-merge", action="store_true", help="Auto-merge approved PRs")
     parser.add_argument("--max-iterations", type=int, default=3, help="Max review-fix iterations")
-    parser.add_argument("--tg-bot-token", type=str, default=os.environ.get("TG_BOT_TOKEN") or os.environ.get("TELEGRAM_API_ID") or os.environ.get("TELEGRAM_BOT_TOKEN"))
-    parser.add_argument("--tg-chat-id", type=str, default=os.environ.get("TG_CHAT_ID") or os.environ.get("TELEGRAM_CHAT_ID"))
+    parser.add_argument("--tg-bot-token", type=str,
+                        help="Telegram bot token (default: $TG_BOT_TOKEN, $TELEGRAM_API_ID or $TELEGRAM_BOT_TOKEN)")
+    parser.add_argument("--tg-chat-id", type=str,
+                        help="Telegram chat ID (default: $TG_CHAT_ID or $TELEGRAM_CHAT_ID)")
     parser.add_argument("--prompt-file", type=str, help="Custom prompt file")
     parser.add_argument("--think", type=str, choices=["normal", "think", "megathink", "ultrathink"],
                         default="normal", help="Thinking budget level (default: normal)")
@@ -2213,6 +3359,19 @@ def main():
     # Use current directory as project path
     project_path = Path(os.getcwd()).resolve()
 
+    # Load environment variables from .env file. Done after --help and
+    # --list-modes have had a chance to exit so those stay cheap.
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(dotenv_path=project_path / ".env", override=False)
+    except ImportError:
+        # python-dotenv not installed, skip loading .env file
+        pass
+
+    args.tg_bot_token = (args.tg_bot_token or os.environ.get("TG_BOT_TOKEN")
+                         or os.environ.get("TELEGRAM_API_ID") or os.environ.get("TELEGRAM_BOT_TOKEN"))
+    args.tg_chat_id = args.tg_chat_id or os.environ.get("TG_CHAT_ID") or os.environ.get("TELEGRAM_CHAT_ID")
+
     # Validate inputs early to catch errors before doing any work
     try:
         if args.create_pr:
@@ -2237,6 +3396,14 @@ def main():
         if success:
             print("\nNext: Edit NORTHSTAR.md, then run the automator (it will auto-detect)")
         sys.exit(0 if success else 1)
+
+    if args.emit_systemd_units:
+        if not args.interval:
+            print("Error: --emit-systemd-units requires --interval N")
+            sys.exit(1)
+        success, msg = emit_systemd_units(project_path, args.interval, sys.argv[1:], install=args.install)
+        print(msg)
+        sys.exit(0 if success else 1)
     selected_modes = []
     review_prompt = None
 
@@ -2252,7 +3419,7 @@ def main():
     elif args.modes:
         for mode in args.modes:
             if mode == "all":
-                selected_modes = list(IMPROVEMENT_MODES.keys())
+                selected_modes = list(MODES)
                 break
             elif mode == "interactive":
                 selected_modes = select_modes_interactive()
@@ -2267,12 +3434,14 @@ def main():
                 review_prompt = prompt
                 selected_modes = ["northstar"]
                 break
-            elif mode in IMPROVEMENT_MODES:
+            elif mode in MODES:
                 selected_modes.append(mode)
             else:
                 print(f"Unknown mode: {mode}")
                 print(get_mode_list())
                 sys.exit(1)
+        # A mode repeated on the command line would otherwise run twice
+        selected_modes = list(dict.fromkeys(selected_modes))
     else:
         # Auto-detect NORTHSTAR.md if it exists
         northstar_path = project_path / "NORTHSTAR.md"
@@ -2417,7 +3586,7 @@ def main():
     elif "northstar" in selected_modes:
         print("Mode: North Star")
     else:
-        print(f"Modes: {', '.join(IMPROVEMENT_MODES[m]['name'] for m in selected_modes if m in IMPROVEMENT_MODES)}")
+        print(f"Modes: {', '.join(MODES[m].name for m in selected_modes if m in MODES)}")
     if args.think != "normal":
         print(f"Thinking: {args.think}")
     if args.create_pr:
@@ -2470,25 +3639,33 @@ def main():
     if resume_session_id:
         reviewer.session_id = resume_session_id
 
+    # Scheduled runs skip cycles when nothing was committed since the last one
+    reviewer.skip_unchanged = args.skip_unchanged
+    reviewer.sequential_modes = args.sequential_modes
+
     # When --auto-answer is enabled without explicit loop flags,
     # default to loop-until-finish behavior (AI consultant drives completion)
-    if use_ai and not any([args.once, args.loop, args.loop_until_finish, args.interval, args.cron]):
-        print("🤖 AI auto-answer enabled: looping until AI determines task is complete")
-        run_loop(reviewer, until_finish=True)
-    elif args.once:
-        sys.exit(0 if reviewer.run_once() else 1)
-    elif args.loop:
-        run_loop(reviewer, until_finish=False)
-    elif args.loop_until_finish:
-        run_loop(reviewer, until_finish=True)
-    elif args.interval:
-        run_with_interval(reviewer, args.interval)
-    elif args.cron:
-        run_with_cron(reviewer, args.cron)
-    else:
-        print("Error: Specify --once, --loop, --loop-until-finish, --interval, or --cron")
-        parser.print_help()
-        sys.exit(1)
+    try:
+        if use_ai and not any([args.once, args.loop, args.loop_until_finish, args.interval, args.cron]):
+            print("🤖 AI auto-answer enabled: looping until AI determines task is complete")
+            run_loop(reviewer, until_finish=True)
+        elif args.once:
+            sys.exit(0 if reviewer.run_once() else 1)
+        elif args.loop:
+            run_loop(reviewer, until_finish=False)
+        elif args.loop_until_finish:
+            run_loop(reviewer, until_finish=True)
+        elif args.interval:
+            run_with_interval(reviewer, args.interval)
+        elif args.cron:
+            run_with_cron(reviewer, args.cron)
+        else:
+            print("Error: Specify --once, --loop, --loop-until-finish, --interval, or --cron")
+            parser.print_help()
+            sys.exit(1)
+    finally:
+        # Deliver any notifications still waiting in the Telegram queue
+        reviewer.telegram.join(timeout=TelegramQueue.EXIT_FLUSH_TIMEOUT)
 
 
 if __name__ == "__main__":
@@ -40,9 +40,10 @@ from pathlib import Path
 
 from .automator import (
     AutoReviewer,
+    TelegramQueue,
     validate_branch_name,
     get_combined_prompt,
-    IMPROVEMENT_MODES,
+    MODES,
 )
 
 
@@ -212,6 +213,10 @@ def run_worker(
             error=str(e),
             duration_seconds=time.time() - start_time,
         )
+    finally:
+        reviewer.close_claude_worker()
+        reviewer.telegram.join(timeout=TelegramQueue.EXIT_FLUSH_TIMEOUT)
+        reviewer.close_log()
 
 
 def run_workers_parallel(
@@ -379,7 +384,7 @@ def main():
                         default="Improve code quality in this directory",
                         help="Default prompt for all workers")
     parser.add_argument("--mode", "-m", type=str, action="append", dest="modes",
-                        choices=list(IMPROVEMENT_MODES.keys()),
+                        choices=list(MODES),
                         help="Improvement mode (can be repeated)")
 
     # Standard options (same as main script)
@@ -401,9 +406,9 @@ def main():
 
     # Notifications
     parser.add_argument("--tg-bot-token", type=str,
-                        default=os.environ.get("TG_BOT_TOKEN"))
+                        help="Telegram bot token (default: $TG_BOT_TOKEN)")
     parser.add_argument("--tg-chat-id", type=str,
-                        default=os.environ.get("TG_CHAT_ID"))
+                        help="Telegram chat ID (default: $TG_CHAT_ID)")
 
     # Other
     parser.add_argument("--dry-run", action="store_true",
@@ -417,6 +422,9 @@ def main():
         args.auto_merge = True
         args.yes = True
 
+    args.tg_bot_token = args.tg_bot_token or os.environ.get("TG_BOT_TOKEN")
+    args.tg_chat_id = args.tg_chat_id or os.environ.get("TG_CHAT_ID")
+
     # Use current directory as project path
     project_dir = Path(os.getcwd()).resolve()
 
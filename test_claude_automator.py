@@ -6,12 +6,17 @@ and core logic. Run with: python -m pytest test_claude_automator.py -v
 or simply: python test_claude_automator.py
 """
 
+import io
+import json
 import os
 import tempfile
+import threading
 import unittest
+from collections import deque
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+from let_claude_code import automator
 from let_claude_code.automator import (
     validate_path,
     validate_branch_name,
@@ -25,8 +30,13 @@ from let_claude_code.automator import (
     load_northstar_prompt,
     create_default_northstar,
     IMPROVEMENT_MODES,
+    MODES,
     LockFile,
     TelegramNotifier,
+    TelegramQueue,
+    LineReader,
+    GitHubClient,
+    GitHubUnreachable,
     AutoReviewer,
 )
 
@@ -242,6 +252,12 @@ class TestGetCombinedPrompt(unittest.TestCase):
         self.assertIn("Security Review", result)
         self.assertIn("multiple types of code improvements", result)
 
+    def test_combined_prompt_is_cached(self):
+        """Should return the same string object for repeated mode combinations."""
+        first = get_combined_prompt(["fix_bugs", "security"])
+        second = get_combined_prompt(["fix_bugs", "security"])
+        self.assertIs(first, second)
+
     def test_all_modes_have_required_fields(self):
         """Should verify all modes have required fields."""
         for key, mode in IMPROVEMENT_MODES.items():
@@ -249,6 +265,18 @@ class TestGetCombinedPrompt(unittest.TestCase):
             self.assertIn("description", mode, f"Mode {key} missing 'description'")
             self.assertIn("prompt", mode, f"Mode {key} missing 'prompt'")
 
+    def test_mode_specs_match_improvement_modes(self):
+        """Should pre-render a frozen ModeSpec for every improvement mode."""
+        self.assertEqual(list(MODES), list(IMPROVEMENT_MODES))
+        spec = MODES["fix_bugs"]
+        self.assertEqual(spec.prompt, IMPROVEMENT_MODES["fix_bugs"]["prompt"])
+        self.assertTrue(spec.section.startswith("## Fix Bugs\n\n"))
+        self.assertEqual(spec.branch_prefix, "fix-bugs")
+        with self.assertRaises(AttributeError):
+            spec.name = "changed"
+        with self.assertRaises(TypeError):
+            MODES["new_mode"] = spec
+
 
 class TestPromptGenerators(unittest.TestCase):
     """Tests for prompt generator functions."""
@@ -280,6 +308,11 @@ class TestPromptGenerators(unittest.TestCase):
         self.assertIn("Make concrete progress", result)
         self.assertIn("Commit your changes", result)
 
+    def test_get_northstar_prompt_keeps_braces_in_content(self):
+        """Braces in NORTHSTAR.md should pass through the template untouched."""
+        result = get_northstar_prompt("Config uses {key} and {{literal}}")
+        self.assertIn("Config uses {key} and {{literal}}", result)
+
     def test_get_pr_review_prompt_includes_pr_number(self):
         """Should include the PR number in the prompt."""
         result = get_pr_review_prompt("123")
@@ -354,6 +387,23 @@ class TestNorthstarFunctions(unittest.TestCase):
             self.assertIsNone(prompt)
             self.assertIn("empty", error)
 
+    def test_load_northstar_prompt_reuses_cache_until_file_changes(self):
+        """Unchanged NORTHSTAR.md should not be re-read; edits should be picked up."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_dir = Path(tmpdir)
+            path = project_dir / "NORTHSTAR.md"
+            path.write_text("# First vision")
+            first, _ = load_northstar_prompt(project_dir)
+
+            with patch.object(Path, "read_text", side_effect=AssertionError("re-read")):
+                again, error = load_northstar_prompt(project_dir)
+            self.assertIsNone(error)
+            self.assertIs(again, first)
+
+            path.write_text("# Second vision, longer")
+            updated, _ = load_northstar_prompt(project_dir)
+            self.assertIn("Second vision", updated)
+
 
 class TestLockFile(unittest.TestCase):
     """Tests for LockFile class."""
@@ -441,6 +491,73 @@ class TestLockFile(unittest.TestCase):
             self.assertFalse(lock2.acquired)
             lock1.release()
 
+    def test_stale_lock_from_dead_process_is_reclaimed(self):
+        """Should take over a lock file left behind by a process that exited."""
+        import subprocess
+        proc = subprocess.Popen(["true"])
+        proc.wait()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            lock_path = Path(tmpdir) / ".test.lock"
+            lock_path.write_text(f"{proc.pid}\n2024-01-01T00:00:00\n")
+            lock = LockFile(lock_path)
+            self.assertTrue(lock.acquire())
+            self.assertEqual(lock.owner_pid(), os.getpid())
+            lock.release()
+
+    def test_reclaim_keeps_lock_replaced_by_another_process(self):
+        """Should not unlink a fresh lock created after the stale PID was read."""
+        import subprocess
+        proc = subprocess.Popen(["true"])
+        proc.wait()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            lock_path = Path(tmpdir) / ".test.lock"
+            lock_path.write_text(f"{proc.pid}\n2024-01-01T00:00:00\n")
+            other = LockFile(lock_path)
+
+            def other_process_takes_over(pid):
+                # Another process reclaims the stale lock and acquires it first
+                lock_path.unlink()
+                other.acquire()
+                return False
+
+            with patch.object(automator, 'pid_is_alive', side_effect=other_process_takes_over):
+                self.assertFalse(LockFile(lock_path).acquire())
+            self.assertTrue(other.acquired)
+            self.assertEqual(LockFile(lock_path).owner_pid(), os.getpid())
+            other.release()
+
+    def test_failed_acquire_keeps_other_owners_file(self):
+        """Should not remove a lock file it never acquired."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            lock_path = Path(tmpdir) / ".test.lock"
+            lock1 = LockFile(lock_path)
+            lock2 = LockFile(lock_path)
+            lock1.acquire()
+            lock2.acquire()
+            lock2.release()
+            self.assertTrue(lock_path.exists())
+            lock1.release()
+
+
+class TestLineReader(unittest.TestCase):
+    """Tests for LineReader class."""
+
+    def test_reads_lines_timeout_and_eof(self):
+        """Should join partial reads into lines, time out, and report EOF."""
+        read_fd, write_fd = os.pipe()
+        with open(read_fd, "rb") as pipe:
+            reader = LineReader(pipe)
+            os.write(write_fd, b"first\nsec")
+            self.assertEqual(reader.readline(1), "first\n")
+            self.assertIsNone(reader.readline(0.01))
+
+            os.write(write_fd, b"ond\ntail")
+            os.close(write_fd)
+            self.assertEqual(reader.readline(1), "second\n")
+            self.assertEqual(reader.readline(1), "tail")
+            self.assertEqual(reader.readline(1), "")
+            reader.close()
+
 
 class TestTelegramNotifier(unittest.TestCase):
     """Tests for TelegramNotifier class."""
@@ -456,6 +573,14 @@ class TestTelegramNotifier(unittest.TestCase):
         notifier = TelegramNotifier(None, "chat_id")
         self.assertFalse(notifier.enabled)
 
+    def test_tg_escape_markdown(self):
+        """Should escape legacy Markdown markup in dynamic text."""
+        self.assertEqual(
+            automator.tg_escape("fix_bug *now* `x` [link]"),
+            r"fix\_bug \*now\* \`x\` \[link]",
+        )
+        self.assertEqual(automator.tg_escape("plain text"), "plain text")
+
     def test_enabled_with_credentials(self):
         """Should be enabled when both credentials provided."""
         notifier = TelegramNotifier("token", "chat_id")
@@ -467,31 +592,341 @@ class TestTelegramNotifier(unittest.TestCase):
         result = notifier.send("test message")
         self.assertFalse(result)
 
-    @patch('urllib.request.urlopen')
-    def test_send_success(self, mock_urlopen):
+    def setUp(self):
+        automator._tg_conn = None
+
+    def tearDown(self):
+        automator._tg_conn = None
+
+    @patch('let_claude_code.automator._TelegramConnection')
+    def test_send_success(self, mock_conn_cls):
         """Should send message and return True on success."""
         mock_response = MagicMock()
         mock_response.status = 200
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_response.read.return_value = b'{"ok": true}'
+        mock_conn_cls.return_value.getresponse.return_value = mock_response
 
         notifier = TelegramNotifier("bot_token", "chat_id")
         result = notifier.send("test message")
+        notifier.join()
 
         self.assertTrue(result)
-        mock_urlopen.assert_called_once()
+        mock_conn_cls.return_value.request.assert_called_once()
+
+    @patch('let_claude_code.automator._TelegramConnection')
+    def test_connection_is_reused(self, mock_conn_cls):
+        """Should keep one connection open across notifications."""
+        mock_response = MagicMock()
+        mock_response.status = 200
+        mock_conn_cls.return_value.getresponse.return_value = mock_response
+
+        notifier = TelegramNotifier("bot_token", "chat_id")
+        notifier.deliver("first")
+        notifier.deliver("second")
+
+        mock_conn_cls.assert_called_once()
+        self.assertEqual(mock_conn_cls.return_value.request.call_count, 2)
+
+    @patch('let_claude_code.automator._TelegramConnection')
+    def test_reconnects_after_remote_disconnect(self, mock_conn_cls):
+        """Should retry once on a fresh connection if the idle one was dropped."""
+        import http.client
+        mock_response = MagicMock()
+        mock_response.status = 200
+        conn = mock_conn_cls.return_value
+        conn.getresponse.side_effect = [http.client.RemoteDisconnected("closed"), mock_response]
 
-    @patch('urllib.request.urlopen')
-    def test_send_failure(self, mock_urlopen):
+        notifier = TelegramNotifier("bot_token", "chat_id")
+
+        self.assertEqual(notifier.deliver("test message"), (True, None))
+        self.assertEqual(mock_conn_cls.call_count, 2)
+
+    def test_pinned_address_resolved_once(self):
+        """Should resolve api.telegram.org once and reuse it for new connections."""
+        import socket
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen(2)
+        addr = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", server.getsockname())]
+        automator._tg_addrs = []
+        try:
+            with patch('socket.getaddrinfo', return_value=addr) as mock_getaddrinfo:
+                automator._tg_open_socket(5).close()
+                automator._tg_open_socket(5).close()
+            mock_getaddrinfo.assert_called_once()
+        finally:
+            server.close()
+            automator._tg_addrs = []
+
+    @patch('let_claude_code.automator._tg_open_socket')
+    def test_connection_verifies_real_hostname(self, mock_open_socket):
+        """The pinned socket should be wrapped with TLS for api.telegram.org."""
+        conn = automator._TelegramConnection(timeout=5)
+        conn.ssl_context = MagicMock()
+        conn.connect()
+
+        mock_open_socket.assert_called_once_with(5)
+        conn.ssl_context.wrap_socket.assert_called_once_with(
+            mock_open_socket.return_value, server_hostname=automator._TELEGRAM_HOST)
+        self.assertIs(conn.sock, conn.ssl_context.wrap_socket.return_value)
+
+    @patch('let_claude_code.automator._TelegramConnection')
+    def test_send_failure(self, mock_conn_cls):
         """Should return False on network error."""
-        import urllib.error
-        mock_urlopen.side_effect = urllib.error.URLError("Network error")
+        mock_conn_cls.return_value.request.side_effect = OSError("Network error")
 
         notifier = TelegramNotifier("bot_token", "chat_id")
-        result = notifier.send("test message")
+        result = notifier.deliver("test message")
 
-        self.assertFalse(result)
+        self.assertEqual(result, (False, None))
+        self.assertIsNone(automator._tg_conn)
+
+    @patch('let_claude_code.automator._TelegramConnection')
+    def test_deliver_reports_retry_after_on_429(self, mock_conn_cls):
+        """Should surface Telegram's retry_after when rate limited."""
+        mock_response = MagicMock()
+        mock_response.status = 429
+        mock_response.read.return_value = b'{"ok": false, "parameters": {"retry_after": 7}}'
+        mock_conn_cls.return_value.getresponse.return_value = mock_response
+
+        notifier = TelegramNotifier("bot_token", "chat_id")
+        self.assertEqual(notifier.deliver("test message"), (False, 7.0))
+
+    @patch('let_claude_code.automator._TelegramConnection')
+    def test_deliver_falls_back_to_plain_text(self, mock_conn_cls):
+        """Should resend without parse_mode when Telegram rejects the Markdown."""
+        rejected, accepted = MagicMock(status=400), MagicMock(status=200)
+        rejected.read.return_value = b'{"ok": false, "description": "Bad Request: can\'t parse entities"}'
+        mock_conn_cls.return_value.getresponse.side_effect = [rejected, accepted]
+
+        notifier = TelegramNotifier("bot_token", "chat_id")
+        self.assertEqual(notifier.deliver("branch fix_bug"), (True, None))
+
+        bodies = [json.loads(c[0][2]) for c in mock_conn_cls.return_value.request.call_args_list]
+        self.assertEqual([b.get("parse_mode") for b in bodies], ["Markdown", None])
+        self.assertEqual(bodies[1]["text"], "branch fix_bug")
+
+    @patch('time.sleep')
+    def test_queue_retries_after_rate_limit(self, mock_sleep):
+        """Should resend the same batch after sleeping for retry_after."""
+        sent = []
+
+        def deliver(message):
+            sent.append(message)
+            return (False, 2.0) if len(sent) == 1 else (True, None)
+
+        queue = TelegramQueue(deliver)
+        queue.put("hello")
+        queue.join()
+
+        self.assertEqual(sent, ["hello", "hello"])
+        mock_sleep.assert_any_call(2.0)
+
+    @patch('builtins.print')
+    def test_queue_survives_failing_deliver(self, mock_print):
+        """An unexpected error should drop that batch but keep the sender thread running."""
+        sent = []
+
+        def deliver(message):
+            if message == "bad":
+                raise KeyError("result")
+            sent.append(message)
+            return True, None
+
+        queue = TelegramQueue(deliver)
+        queue.coalesce_window = 0
+        queue.put("bad")
+        self.assertTrue(queue.join(timeout=5))
+        queue.put("good")
+        self.assertTrue(queue.join(timeout=5))
+
+        self.assertEqual(sent, ["good"])
+        self.assertTrue(queue._thread.is_alive())
+
+    def test_queue_join_times_out(self):
+        """join(timeout) should give up and report pending messages."""
+        release = threading.Event()
+
+        def deliver(message):
+            release.wait()
+            return True, None
+
+        queue = TelegramQueue(deliver)
+        queue.put("slow")
+        self.assertFalse(queue.join(timeout=0.05))
+        release.set()
+        self.assertTrue(queue.join(timeout=5))
+
+    def test_queue_coalesces_pending_messages(self):
+        """Should join messages queued while waiting into one send."""
+        queue = TelegramQueue(lambda message: (True, None))
+        queue._pending.extend(["one", "two", "x" * TelegramQueue.MAX_MESSAGE_CHARS])
+
+        self.assertEqual(queue._take_batch(), "one" + TelegramQueue.SEPARATOR + "two")
+        self.assertEqual(len(queue._take_batch()), TelegramQueue.MAX_MESSAGE_CHARS)
+
+    def test_queue_counts_dropped_messages(self):
+        """Should count the oldest messages dropped once MAX_PENDING is reached."""
+        queue = TelegramQueue(lambda message: (True, None))
+        queue._pending = deque(maxlen=2)
+        queue._thread = MagicMock()  # Keep the messages pending
+        with patch.object(TelegramQueue, "MAX_PENDING", 2), patch('builtins.print') as mock_print:
+            for message in ("one", "two", "three", "four"):
+                queue.put(message)
+
+        self.assertEqual(list(queue._pending), ["three", "four"])
+        self.assertEqual(queue.dropped, 2)
+        self.assertEqual(mock_print.call_count, 2)
+
+    def test_queues_for_one_chat_share_rate_limit(self):
+        """Queues sending to the same chat should draw from one token bucket."""
+        first = TelegramQueue(lambda message: (True, None), "shared-chat")
+        second = TelegramQueue(lambda message: (True, None), "shared-chat")
+        other = TelegramQueue(lambda message: (True, None), "other-chat")
+
+        self.assertIs(first._bucket, second._bucket)
+        self.assertIsNot(first._bucket, other._bucket)
+        with patch('time.sleep') as mock_sleep:
+            for _ in range(TelegramQueue.BURST):
+                first._bucket.acquire()
+            mock_sleep.side_effect = StopIteration  # The next send would have to wait
+            with self.assertRaises(StopIteration):
+                second._bucket.acquire()
+
+    def test_queue_coalesces_burst_into_one_send(self):
+        """Messages put in quick succession should go out as a single request."""
+        sent = []
+        queue = TelegramQueue(lambda message: (sent.append(message), (True, None))[1])
+        for message in ("PR created", "Review started", "Approved"):
+            queue.put(message)
+        queue.join()
+
+        self.assertEqual(sent, [TelegramQueue.SEPARATOR.join(["PR created", "Review started", "Approved"])])
+
+    def test_split_message_on_paragraphs(self):
+        """Oversized messages should be split on blank lines under the limit."""
+        limit = TelegramQueue.MAX_MESSAGE_CHARS
+        paragraphs = ["a" * 3000, "b" * 3000, "c" * (limit + 10)]
+        chunks = TelegramQueue.split_message("\n\n".join(paragraphs))
+
+        self.assertEqual(chunks, ["a" * 3000, "b" * 3000, "c" * limit, "c" * 10])
+        self.assertEqual(TelegramQueue.split_message("short"), ["short"])
+
+    def test_split_message_keeps_markdown_spans_whole(self):
+        """Should not cut inside a code block, bold span, or escape."""
+        limit = TelegramQueue.MAX_MESSAGE_CHARS
+        code = "```\n" + "x\n\n" * 200 + "```"
+        message = "a" * (limit - 300) + " " + code + " *" + "b" * 400 + "*"
+        chunks = TelegramQueue.split_message(message)
+
+        self.assertEqual("".join(chunks), message)
+        self.assertEqual(chunks[0], "a" * (limit - 300) + " ")
+        self.assertTrue(all(c.count("```") % 2 == 0 and c.count("*") % 2 == 0 for c in chunks))
+
+        escaped = "a" * (limit - 1) + r"\_tail"
+        self.assertEqual(TelegramQueue.split_message(escaped), ["a" * (limit - 1), r"\_tail"])
+
+    def test_cycle_flushes_without_waiting_out_window(self):
+        """Leaving a cycle should deliver buffered messages immediately."""
+        sent = []
+        notifier = TelegramNotifier("token", "chat")
+        notifier.deliver = lambda message: (sent.append(message), (True, None))[1]
+        notifier._queue._deliver = notifier.deliver
+
+        with patch.object(TelegramQueue, "CYCLE_FLUSH_INTERVAL", 60):
+            with notifier.cycle():
+                notifier.send("Review started")
+                notifier.send("Approved")
+            self.assertTrue(notifier.join(timeout=5))
+
+        self.assertEqual(sent, ["Review started" + TelegramQueue.SEPARATOR + "Approved"])
+        self.assertEqual(notifier._queue.coalesce_window, TelegramQueue.COALESCE_WINDOW)
+
+
+class TestGitHubClient(unittest.TestCase):
+    """Tests for GitHubClient class."""
+
+    def setUp(self):
+        self.client = GitHubClient(Path(tempfile.gettempdir()))
+        self.client._resolved = True
+        self.client.token = "token"
+        self.client.repo = "owner/repo"
+
+    @staticmethod
+    def _response(status, body=b"", headers=None):
+        response = MagicMock()
+        response.status = status
+        response.read.return_value = body
+        response.getheader.side_effect = lambda name, default=None: (headers or {}).get(name, default)
+        return response
+
+    def test_remote_url_parsing(self):
+        """Should extract owner/name from HTTPS and SSH remotes."""
+        for url in ("https://github.com/owner/repo.git", "git@github.com:owner/repo.git",
+                    "https://github.com/owner/repo"):
+            self.assertEqual(automator._GITHUB_REMOTE_RE.search(url).group(1), "owner/repo")
+        self.assertIsNone(automator._GITHUB_REMOTE_RE.search("https://gitlab.com/owner/repo.git"))
+
+    @patch('http.client.HTTPSConnection')
+    def test_create_pull_reuses_connection(self, mock_conn_cls):
+        """Should POST to the pulls endpoint over one kept-alive connection."""
+        body = b'{"html_url": "https://github.com/owner/repo/pull/7"}'
+        mock_conn_cls.return_value.sock = None
+        mock_conn_cls.return_value.getresponse.side_effect = [
+            self._response(201, body), self._response(201, body),
+        ]
+
+        url = self.client.create_pull("Title", "Body", "feature", "main")
+        self.client.create_pull("Title", "Body", "feature", "main")
+
+        self.assertEqual(url, "https://github.com/owner/repo/pull/7")
+        mock_conn_cls.assert_called_once()
+        method, path = mock_conn_cls.return_value.request.call_args[0][:2]
+        self.assertEqual((method, path), ("POST", "/repos/owner/repo/pulls"))
+
+    @patch('time.sleep')
+    @patch('http.client.HTTPSConnection')
+    def test_waits_for_rate_limit_reset(self, mock_conn_cls, mock_sleep):
+        """Should sleep until X-RateLimit-Reset and retry once."""
+        import time
+        reset = str(int(time.time()) + 30)
+        mock_conn_cls.return_value.sock = None
+        mock_conn_cls.return_value.getresponse.side_effect = [
+            self._response(403, b"{}", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}),
+            self._response(200, b'{"merged": true}'),
+        ]
+
+        self.assertTrue(self.client.merge_pull("7"))
+        mock_sleep.assert_called_once()
+
+    @patch('http.client.HTTPSConnection')
+    def test_does_not_resend_after_request_was_sent(self, mock_conn_cls):
+        """Should not repeat a POST whose response was lost; GitHub may have acted on it."""
+        import http.client
+        mock_conn_cls.return_value.sock = None
+        mock_conn_cls.return_value.getresponse.side_effect = http.client.RemoteDisconnected("closed")
+
+        with self.assertRaises(http.client.RemoteDisconnected):
+            self.client.create_pull("Title", "Body", "feature", "main")
+        mock_conn_cls.return_value.request.assert_called_once()
+
+    @patch('http.client.HTTPSConnection')
+    def test_retries_unsent_request_on_fresh_connection(self, mock_conn_cls):
+        """Should retry once when a kept-alive connection fails before the request is written."""
+        stale, fresh = MagicMock(sock=None), MagicMock(sock=None)
+        stale.getresponse.return_value = self._response(200, b'{"merged": true}')
+        fresh.getresponse.return_value = self._response(200, b'{"merged": true}')
+        mock_conn_cls.side_effect = [stale, fresh]
+        self.assertTrue(self.client.merge_pull("7"))
+
+        stale.request.side_effect = BrokenPipeError()
+        self.assertTrue(self.client.merge_pull("7"))
+        fresh.request.assert_called_once()
+
+    def test_unavailable_without_github_remote(self):
+        """Should report unavailable when the project has no GitHub origin."""
+        with tempfile.TemporaryDirectory() as tmpdir, patch.dict(os.environ, {"GH_TOKEN": "token"}):
+            self.assertFalse(GitHubClient(Path(tmpdir)).available)
 
 
 class TestAutoReviewer(unittest.TestCase):
@@ -548,49 +983,72 @@ class TestAutoReviewer(unittest.TestCase):
         log_content = self.reviewer.log_file.read_text()
         self.assertIn("Test message", log_content)
 
-    @patch('subprocess.run')
-    def test_run_cmd_success(self, mock_run):
+    def test_log_reuses_file_handle(self):
+        """Should open the log file once and keep appending to it."""
+        with patch("builtins.open", wraps=open) as mock_open:
+            self.reviewer.log("first")
+            self.reviewer.log("second")
+        self.assertEqual(mock_open.call_count, 1)
+        self.assertIn("first", self.reviewer.log_file.read_text())
+        self.assertIn("second", self.reviewer.log_file.read_text())
+
+        self.reviewer.close_log()
+        self.reviewer.log("third")
+        self.assertIn("third", self.reviewer.log_file.read_text())
+        self.reviewer.close_log()
+
+    @patch('subprocess.Popen')
+    def test_run_cmd_success(self, mock_popen):
         """Should return success and output on successful command."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="output",
-            stderr=""
-        )
+        mock_popen.return_value.communicate.return_value = ("output", "")
+        mock_popen.return_value.returncode = 0
 
         success, output = self.reviewer.run_cmd(["echo", "test"])
 
         self.assertTrue(success)
         self.assertEqual(output, "output")
 
-    @patch('subprocess.run')
-    def test_run_cmd_failure(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_run_cmd_failure(self, mock_popen):
         """Should return failure and output on failed command."""
-        mock_run.return_value = MagicMock(
-            returncode=1,
-            stdout="",
-            stderr="error message"
-        )
+        mock_popen.return_value.communicate.return_value = ("", "error message")
+        mock_popen.return_value.returncode = 1
 
         success, output = self.reviewer.run_cmd(["false"])
 
         self.assertFalse(success)
         self.assertIn("error message", output)
 
-    @patch('subprocess.run')
-    def test_run_cmd_timeout(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_run_cmd_timeout(self, mock_popen):
         """Should handle command timeout gracefully."""
         import subprocess
-        mock_run.side_effect = subprocess.TimeoutExpired("cmd", 60)
+        process = mock_popen.return_value
+        process.communicate.side_effect = [subprocess.TimeoutExpired("cmd", 60), ("", "")]
 
         success, output = self.reviewer.run_cmd(["sleep", "999"])
 
         self.assertFalse(success)
         self.assertIn("timed out", output)
+        process.kill.assert_called_once()
 
-    @patch('subprocess.run')
-    def test_run_cmd_command_not_found(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_run_cmd_waits_for_child_on_ctrl_c(self, mock_popen):
+        """Ctrl+C should let the child exit on its own SIGINT rather than SIGKILL it."""
+        process = mock_popen.return_value
+        process.communicate.side_effect = KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.reviewer.run_cmd(["git", "commit", "-m", "x"])
+
+        process.wait.assert_called_once_with()
+        process.kill.assert_not_called()
+        self.assertNotIn("start_new_session", mock_popen.call_args.kwargs)
+
+    @patch('subprocess.Popen')
+    def test_run_cmd_command_not_found(self, mock_popen):
         """Should handle command not found gracefully."""
-        mock_run.side_effect = FileNotFoundError()
+        mock_popen.side_effect = FileNotFoundError()
 
         success, output = self.reviewer.run_cmd(["nonexistent_cmd"])
 
@@ -607,15 +1065,14 @@ class TestAutoReviewer(unittest.TestCase):
         self.assertFalse(success)
         self.assertIn("Claude CLI not found", output)
 
-    @patch('time.time')
+    @patch('let_claude_code.automator.LineReader')
     @patch('subprocess.Popen')
-    def test_run_claude_timeout(self, mock_popen, mock_time):
+    def test_run_claude_timeout(self, mock_popen, mock_reader):
         """Should handle Claude timeout gracefully."""
-        # Simulate time passing beyond timeout
-        mock_time.side_effect = [0, 0, 10]  # start_time, first check, timeout check
+        # No output arrives before the deadline
+        mock_reader.return_value.readline.return_value = None
 
         mock_process = MagicMock()
-        mock_process.stdout.readline.return_value = ""
         mock_process.poll.return_value = None
         mock_process.kill = MagicMock()
         mock_popen.return_value = mock_process
@@ -626,33 +1083,150 @@ class TestAutoReviewer(unittest.TestCase):
         self.assertIn("timed out", output)
         mock_process.kill.assert_called_once()
 
-    @patch.object(AutoReviewer, 'run_cmd')
-    def test_has_commits_ahead_true(self, mock_run_cmd):
+    @patch('let_claude_code.automator.LineReader')
+    @patch('subprocess.Popen')
+    def test_run_claude_reuses_worker_process(self, mock_popen, mock_reader):
+        """Should send each prompt to the same long-lived Claude process."""
+        result = json.dumps({"type": "result", "session_id": "abc", "total_cost_usd": 0})
+        assistant = json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": "done"}]}})
+        mock_process = MagicMock()
+        mock_process.poll.return_value = None
+        mock_reader.return_value.readline.side_effect = [assistant + "\n", result + "\n"] * 2
+        mock_popen.return_value = mock_process
+
+        with patch.object(AutoReviewer, 'save_session'):
+            first = self.reviewer.run_claude("first prompt")
+            second = self.reviewer.run_claude("second prompt")
+
+        self.assertEqual(first, (True, "done"))
+        self.assertEqual(second, (True, "done"))
+        mock_popen.assert_called_once()
+        self.assertIn("--input-format", mock_popen.call_args[0][0])
+        self.assertEqual(mock_process.stdin.write.call_count, 2)
+        self.assertEqual(self.reviewer.session_id, "abc")
+
+    @patch('let_claude_code.automator.LineReader')
+    @patch('subprocess.Popen')
+    def test_run_claude_sends_think_level_as_separate_block(self, mock_popen, mock_reader):
+        """Should keep the prompt block unchanged and append the think keyword as its own block."""
+        result = json.dumps({"type": "result", "total_cost_usd": 0})
+        assistant = json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": "done"}]}})
+        mock_process = MagicMock()
+        mock_process.poll.return_value = None
+        mock_reader.return_value.readline.side_effect = [assistant + "\n", result + "\n"]
+        mock_popen.return_value = mock_process
+        self.reviewer.think_level = "ultrathink"
+
+        self.reviewer.run_claude("static prompt")
+
+        sent = json.loads(mock_process.stdin.write.call_args[0][0])
+        self.assertEqual(sent["message"]["content"], [
+            {"type": "text", "text": "static prompt"},
+            {"type": "text", "text": "ultrathink"},
+        ])
+
+    @patch.object(AutoReviewer, 'git_query')
+    def test_has_commits_ahead_true(self, mock_git_query):
         """Should detect commits ahead of base branch."""
-        mock_run_cmd.return_value = (True, "5")
+        mock_git_query.return_value = "5"
 
         result = self.reviewer.has_commits_ahead()
 
         self.assertTrue(result)
 
-    @patch.object(AutoReviewer, 'run_cmd')
-    def test_has_commits_ahead_false(self, mock_run_cmd):
+    @patch.object(AutoReviewer, 'git_query')
+    def test_has_commits_ahead_false(self, mock_git_query):
         """Should detect no commits ahead of base branch."""
-        mock_run_cmd.return_value = (True, "0")
+        mock_git_query.return_value = "0"
 
         result = self.reviewer.has_commits_ahead()
 
         self.assertFalse(result)
 
-    @patch.object(AutoReviewer, 'run_cmd')
-    def test_has_commits_ahead_invalid_output(self, mock_run_cmd):
+    @patch.object(AutoReviewer, 'git_query')
+    def test_has_commits_ahead_invalid_output(self, mock_git_query):
         """Should handle invalid git output gracefully."""
-        mock_run_cmd.return_value = (True, "not a number")
+        mock_git_query.return_value = "not a number"
 
         result = self.reviewer.has_commits_ahead()
 
         self.assertFalse(result)
 
+    @patch.object(AutoReviewer, 'has_changes', return_value=True)
+    @patch.object(AutoReviewer, 'has_commits_ahead', return_value=False)
+    def test_work_status_runs_both_checks(self, mock_ahead, mock_changes):
+        """Should report commits-ahead and uncommitted-changes together."""
+        self.assertEqual(self.reviewer.work_status(), (False, True))
+        mock_ahead.assert_called_once()
+        mock_changes.assert_called_once()
+
+    @patch.object(AutoReviewer, 'has_changes', return_value=False)
+    @patch.object(AutoReviewer, 'git_query', return_value="abc123")
+    @patch.object(AutoReviewer, 'run_claude', return_value=(True, "done"))
+    def test_sequential_modes_run_every_mode(self, mock_claude, mock_git_query, mock_changes):
+        """Should run every mode even when earlier ones leave the tree unchanged."""
+        reviewer = AutoReviewer(project_dir=self.tmpdir, modes=["fix_bugs", "security", "add_tests", "add_docs"])
+        reviewer.sequential_modes = True
+
+        success, summary = reviewer.run_review_prompt()
+
+        self.assertTrue(success)
+        self.assertEqual(mock_claude.call_count, 4)
+        self.assertIn("Security Review: done", summary)
+
+    @patch.object(AutoReviewer, 'run_claude', return_value=(True, "done"))
+    def test_run_review_prompt_combined_by_default(self, mock_claude):
+        """Should send the combined prompt in one call unless sequential_modes is set."""
+        reviewer = AutoReviewer(project_dir=self.tmpdir, modes=["fix_bugs", "security"])
+        reviewer.run_review_prompt()
+        mock_claude.assert_called_once_with(reviewer.review_prompt, 3600)
+
+    @patch.object(AutoReviewer, 'git_query')
+    def test_has_changes(self, mock_git_query):
+        """Should treat any porcelain output as uncommitted changes."""
+        mock_git_query.return_value = " M file.py"
+        self.assertTrue(self.reviewer.has_changes())
+        mock_git_query.return_value = ""
+        self.assertFalse(self.reviewer.has_changes())
+        mock_git_query.return_value = None
+        self.assertFalse(self.reviewer.has_changes())
+
+    def test_run_cmds_returns_results_in_order(self):
+        """Should run commands concurrently and keep results in input order."""
+        import sys
+        results = self.reviewer.run_cmds([
+            (sys.executable, "-c", "import time; time.sleep(0.2); print('slow')"),
+            (sys.executable, "-c", "print('fast')"),
+            ("no-such-command-xyz",),
+        ])
+
+        self.assertEqual(results[0], (True, "slow\n"))
+        self.assertEqual(results[1], (True, "fast\n"))
+        self.assertFalse(results[2][0])
+        self.assertIn("Command not found", results[2][1])
+
+    def test_git_query_runs_in_project_dir(self):
+        """Should return stripped stdout from the project repo, or None on failure."""
+        import subprocess
+        subprocess.run(["git", "init", "-q", "-b", "trunk", self.reviewer.project_dir], check=True)
+
+        self.assertEqual(self.reviewer.git_query(("git", "symbolic-ref", "--short", "HEAD")), "trunk")
+        self.assertIsNone(self.reviewer.git_query(("git", "rev-parse", "--verify", "no-such-ref")))
+
+    def test_fast_check_output_kills_hung_command(self):
+        """Should kill a command that outlives the timeout and report a negative exit code."""
+        import time
+        from let_claude_code.automator import fast_check_output
+
+        self.assertEqual(fast_check_output(("sh", "-c", "echo hi")), (0, b"hi\n"))
+
+        started = time.monotonic()
+        code, output = fast_check_output(("sh", "-c", "echo partial; exec sleep 30"), timeout=0.3)
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertLess(code, 0)
+        self.assertEqual(output, b"partial\n")
+
     @patch.object(AutoReviewer, 'run_cmd')
     def test_merge_pr(self, mock_run_cmd):
         """Should call gh with correct arguments."""
@@ -667,6 +1241,13 @@ class TestAutoReviewer(unittest.TestCase):
         self.assertIn("merge", call_args)
         self.assertIn("123", call_args)
 
+    def test_pr_number_from_url(self):
+        """Should extract the PR number regardless of trailing path or slash."""
+        for url in ("https://github.com/owner/repo/pull/123",
+                    "https://github.com/owner/repo/pull/123/",
+                    "https://github.com/owner/repo/pull/123/files"):
+            self.assertEqual(AutoReviewer._pr_number(url), "123")
+
     @patch.object(AutoReviewer, 'run_cmd')
     def test_cleanup_branch(self, mock_run_cmd):
         """Should checkout base branch on cleanup."""
@@ -719,6 +1300,34 @@ class TestAutoReviewer(unittest.TestCase):
 
         self.assertEqual(result, "https://github.com/owner/repo/pull/123")
 
+    @patch.object(AutoReviewer, 'run_cmd')
+    @patch.object(AutoReviewer, 'has_commits_ahead')
+    def test_create_pull_request_skips_gh_after_api_error(self, mock_has_commits, mock_run_cmd):
+        """Should not retry with gh when the API answered, so no duplicate PR is opened."""
+        mock_has_commits.return_value = True
+        mock_run_cmd.return_value = (True, "")  # git push
+        self.reviewer.github = MagicMock(available=True)
+        self.reviewer.github.create_pull.return_value = None
+        self.reviewer.current_branch = "test-branch"
+
+        self.assertIsNone(self.reviewer.create_pull_request("Test summary"))
+        self.assertNotIn("gh", [c[0][0][0] for c in mock_run_cmd.call_args_list])
+
+    @patch.object(AutoReviewer, 'run_cmd')
+    @patch.object(AutoReviewer, 'has_commits_ahead')
+    def test_create_pull_request_falls_back_to_gh_when_unreachable(self, mock_has_commits, mock_run_cmd):
+        """Should use gh when the API request never reached GitHub."""
+        mock_has_commits.return_value = True
+        mock_run_cmd.side_effect = [
+            (True, ""),  # git push
+            (True, "https://github.com/owner/repo/pull/123\n"),  # gh pr create
+        ]
+        self.reviewer.github = MagicMock(available=True)
+        self.reviewer.github.create_pull.side_effect = GitHubUnreachable("down")
+        self.reviewer.current_branch = "test-branch"
+
+        self.assertEqual(self.reviewer.create_pull_request("Test summary"), "https://github.com/owner/repo/pull/123")
+
     @patch.object(AutoReviewer, 'has_commits_ahead')
     def test_create_pull_request_no_commits(self, mock_has_commits):
         """Should return None when no commits ahead."""
@@ -812,8 +1421,8 @@ class TestSchedulingFunctions(unittest.TestCase):
         # Should have called run_once 3 times
         self.assertEqual(mock_run_once.call_count, 3)
 
-    @patch('time.sleep')
-    @patch('time.time')
+    @patch('let_claude_code.automator.sleep_until')
+    @patch('time.monotonic')
     @patch.object(AutoReviewer, 'run_once')
     @patch('builtins.print')
     def test_run_with_interval_respects_interval(self, mock_print, mock_run_once, mock_time, mock_sleep):
@@ -848,46 +1457,114 @@ class TestSchedulingFunctions(unittest.TestCase):
         except KeyboardInterrupt:
             pass
 
-        # Should have called sleep with 8 seconds (10 - 2 = 8)
-        mock_sleep.assert_called_with(8)
+        # Should sleep until the deadline set before the run (0 + 10),
+        # i.e. the remaining 8 seconds
+        mock_sleep.assert_called_with(10)
 
-    @patch('time.sleep')
-    @patch('time.time')
+    @patch('let_claude_code.automator.sleep_until')
+    @patch('time.monotonic')
     @patch.object(AutoReviewer, 'run_once')
     @patch('builtins.print')
-    def test_run_with_interval_no_sleep_if_run_exceeds_interval(self, mock_print, mock_run_once, mock_time, mock_sleep):
-        """Should not sleep if run_once takes longer than interval."""
+    def test_run_with_interval_waits_for_next_slot_after_long_run(self, mock_print, mock_run_once, mock_time, mock_sleep):
+        """A run longer than the interval should be followed by the next grid slot, not a later one."""
         from let_claude_code.automator import run_with_interval
 
-        # Simulate run_once taking 15 seconds when interval is 10
-        call_count = 0
-        def time_side_effect():
-            nonlocal call_count
-            call_count += 1
-            if call_count % 2 == 1:
-                return 0
-            else:
-                return 15
+        # interval 10, the run takes 25s: the next run starts at 30, not 40
+        mock_time.side_effect = [0, 25]
+        mock_run_once.side_effect = [True, KeyboardInterrupt()]
 
-        mock_time.side_effect = time_side_effect
+        with self.assertRaises(KeyboardInterrupt):
+            run_with_interval(self.reviewer, 10)
 
-        run_count = 0
-        def run_once_side_effect():
-            nonlocal run_count
-            run_count += 1
-            if run_count >= 2:
-                raise KeyboardInterrupt()
-            return True
+        mock_sleep.assert_called_once_with(30)
 
-        mock_run_once.side_effect = run_once_side_effect
+    @patch('let_claude_code.automator.sleep_until')
+    @patch('time.monotonic')
+    @patch.object(AutoReviewer, 'run_once')
+    @patch('builtins.print')
+    def test_run_with_interval_realigns_after_overrun(self, mock_print, mock_run_once, mock_time, mock_sleep):
+        """Should skip missed slots after an overrun and stay on the interval grid."""
+        from let_claude_code.automator import run_with_interval
 
-        try:
+        # Start at 0; the first run ends at 35 (slots 10, 20, 30 overrun) and
+        # waits for 40; the second ends at 42, so the next slot is 50
+        mock_time.side_effect = [0, 35, 42]
+        mock_run_once.side_effect = [True, True, KeyboardInterrupt()]
+
+        with self.assertRaises(KeyboardInterrupt):
             run_with_interval(self.reviewer, 10)
-        except KeyboardInterrupt:
-            pass
 
-        # Should not have called sleep since max(0, 10-15) = 0
-        mock_sleep.assert_not_called()
+        self.assertEqual([c[0][0] for c in mock_sleep.call_args_list], [40, 50])
+
+    def test_systemd_units_run_once_on_interval(self):
+        """Should build a timer firing every interval and a --once service."""
+        from let_claude_code.automator import systemd_unit_files
+
+        units = systemd_unit_files(
+            Path("/srv/my repo"), 3600,
+            ["--interval", "3600", "-m", "fix_bugs", "--cron=0 * * * *", "--emit-systemd-units", "--install"],
+        )
+
+        self.assertEqual(sorted(units), ["cook-my-repo.service", "cook-my-repo.timer"])
+        self.assertIn("OnUnitActiveSec=3600s", units["cook-my-repo.timer"])
+        service = units["cook-my-repo.service"]
+        self.assertIn("WorkingDirectory=/srv/my repo", service)
+        exec_line = next(line for line in service.splitlines() if line.startswith("ExecStart="))
+        self.assertTrue(exec_line.endswith("-m let_claude_code --once -m fix_bugs -y"))
+
+    def test_systemd_unit_files_escapes_specifiers_and_variables(self):
+        """Should double % and $ so systemd doesn't expand forwarded values."""
+        from let_claude_code.automator import systemd_unit_files
+
+        units = systemd_unit_files(Path("/srv/100%"), 3600, ["--goal", "cut 50% of $HOME ${PATH}"])
+
+        service = units["cook-100-.service"]
+        exec_line = next(line for line in service.splitlines() if line.startswith("ExecStart="))
+        self.assertIn("'cut 50%% of $$HOME $${PATH}'", exec_line)
+        self.assertIn("WorkingDirectory=/srv/100%%", service)
+
+    def test_emit_systemd_units_writes_files(self):
+        """Should write both unit files without enabling them unless asked."""
+        from let_claude_code.automator import emit_systemd_units
+
+        with patch('subprocess.run') as mock_run:
+            success, msg = emit_systemd_units(Path(self.tmpdir), 600, ["--interval", "600"], unit_dir=Path(self.tmpdir) / "units")
+
+        self.assertTrue(success)
+        mock_run.assert_not_called()
+        self.assertEqual(len(list((Path(self.tmpdir) / "units").iterdir())), 2)
+        self.assertIn("systemctl --user enable --now", msg)
+
+    def test_sleep_until_returns_after_deadline(self):
+        """Should sleep until the monotonic deadline has passed."""
+        import time
+        from let_claude_code.automator import sleep_until
+
+        deadline = time.monotonic() + 0.05
+        sleep_until(deadline)
+
+        self.assertGreaterEqual(time.monotonic(), deadline)
+
+    @unittest.skipUnless(hasattr(__import__("signal"), "sigtimedwait"), "requires sigtimedwait")
+    def test_sleep_until_wakes_on_signal(self):
+        """Should return early and run the normal handler when signalled."""
+        import signal
+        import time
+        from let_claude_code.automator import sleep_until
+
+        received = []
+        previous = signal.signal(signal.SIGHUP, lambda signum, frame: received.append(signum))
+        try:
+            timer = threading.Timer(0.05, os.kill, (os.getpid(), signal.SIGHUP))
+            timer.start()
+            start = time.monotonic()
+            sleep_until(start + 5)
+            timer.join()
+        finally:
+            signal.signal(signal.SIGHUP, previous)
+
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(received, [signal.SIGHUP])
 
 
 class TestRunOnceWorkflow(unittest.TestCase):
@@ -1105,6 +1782,102 @@ class TestRunOnceWorkflow(unittest.TestCase):
         self.assertEqual(mock_review.call_count, 2)
         self.assertEqual(mock_fix.call_count, 2)
 
+    @patch.object(AutoReviewer, 'current_revision')
+    @patch.object(AutoReviewer, 'run_cycle')
+    def test_run_once_skips_unchanged_revision(self, mock_cycle, mock_revision):
+        """Should skip the cycle when the tree hasn't moved since the last successful run."""
+        self.reviewer.skip_unchanged = True
+        mock_revision.return_value = "abc123"
+        mock_cycle.return_value = True
+
+        self.assertTrue(self.reviewer.run_once())
+        self.assertEqual(self.reviewer.load_last_revision(), "abc123")
+
+        self.assertTrue(self.reviewer.run_once())
+        mock_cycle.assert_called_once()
+
+        mock_revision.return_value = "def456"
+        self.reviewer.run_once()
+        self.assertEqual(mock_cycle.call_count, 2)
+        self.assertEqual(mock_revision.call_count, 3)  # One lookup per run
+
+    @patch.object(AutoReviewer, 'current_revision')
+    @patch.object(AutoReviewer, 'run_cycle')
+    def test_run_once_counts_own_commits_as_changes(self, mock_cycle, mock_revision):
+        """Should record the revision from before the cycle, so the next run sees its commits."""
+        self.reviewer.skip_unchanged = True
+        mock_revision.return_value = "before"
+
+        def cycle_commits():
+            mock_revision.return_value = "after"
+            return True
+
+        mock_cycle.side_effect = cycle_commits
+
+        self.reviewer.run_once()
+        self.assertEqual(self.reviewer.load_last_revision(), "before")
+        self.reviewer.run_once()
+        self.assertEqual(mock_cycle.call_count, 2)
+
+    @patch.object(TelegramNotifier, 'send')
+    @patch.object(AutoReviewer, 'cleanup_branch')
+    @patch.object(AutoReviewer, 'get_branch_diff')
+    @patch.object(AutoReviewer, 'fix_pr_feedback')
+    @patch.object(AutoReviewer, 'review_pr_with_claude')
+    @patch.object(AutoReviewer, 'create_pull_request')
+    @patch.object(AutoReviewer, 'has_commits_ahead')
+    @patch.object(AutoReviewer, 'run_claude')
+    @patch.object(AutoReviewer, 'create_branch')
+    @patch.object(LockFile, 'acquire')
+    @patch.object(LockFile, 'release')
+    def test_run_once_stops_when_fix_makes_no_progress(self, mock_release, mock_acquire, mock_create, mock_claude, mock_commits, mock_pr, mock_review, mock_fix, mock_diff, mock_cleanup, mock_tg):
+        """Should not re-run the fixer on a diff and feedback it already saw."""
+        self.reviewer.max_iterations = 3
+        mock_acquire.return_value = True
+        mock_create.return_value = True
+        mock_claude.return_value = (True, "Made changes")
+        mock_commits.return_value = True
+        mock_pr.return_value = "https://github.com/owner/repo/pull/123"
+        mock_review.return_value = (False, "CHANGES_REQUESTED: Still not right", "Fix it")
+        mock_fix.return_value = (True, "Tried to fix")
+        # The fixer doesn't change anything
+        mock_diff.return_value = "diff --git a/x b/x"
+
+        result = self.reviewer.run_once()
+
+        self.assertTrue(result)
+        self.assertEqual(mock_review.call_count, 2)
+        mock_fix.assert_called_once()
+
+    @patch.object(TelegramNotifier, 'send')
+    @patch.object(AutoReviewer, 'cleanup_branch')
+    @patch.object(AutoReviewer, 'git_query')
+    @patch.object(AutoReviewer, 'fix_pr_feedback')
+    @patch.object(AutoReviewer, 'review_pr_with_claude')
+    @patch.object(AutoReviewer, 'create_pull_request')
+    @patch.object(AutoReviewer, 'has_commits_ahead')
+    @patch.object(AutoReviewer, 'run_claude')
+    @patch.object(AutoReviewer, 'create_branch')
+    @patch.object(LockFile, 'acquire')
+    @patch.object(LockFile, 'release')
+    def test_run_once_stops_when_fixer_commits_nothing(self, mock_release, mock_acquire, mock_create, mock_claude, mock_commits, mock_pr, mock_review, mock_fix, mock_query, mock_cleanup, mock_tg):
+        """Should skip the next review when the fixer left HEAD where it was."""
+        self.reviewer.max_iterations = 3
+        mock_acquire.return_value = True
+        mock_create.return_value = True
+        mock_claude.return_value = (True, "Made changes")
+        mock_commits.return_value = True
+        mock_pr.return_value = "https://github.com/owner/repo/pull/123"
+        mock_review.return_value = (False, "CHANGES_REQUESTED: Still not right", "Fix it")
+        mock_fix.return_value = (True, "Nothing to change")
+        mock_query.return_value = "abc123"
+
+        result = self.reviewer.run_once()
+
+        self.assertTrue(result)
+        mock_review.assert_called_once()
+        mock_fix.assert_called_once()
+
     @patch.object(TelegramNotifier, 'send')
     @patch.object(AutoReviewer, 'cleanup_branch')
     @patch.object(AutoReviewer, 'fix_pr_feedback')
@@ -1133,5 +1906,428 @@ class TestRunOnceWorkflow(unittest.TestCase):
         self.assertTrue(any("Fixer Failed" in str(call) for call in mock_tg.call_args_list))
 
 
+class TestAudit(unittest.TestCase):
+    """Tests for the audit command's helpers."""
+
+    def test_read_target_walks_sources_and_prunes_skipped_dirs(self):
+        """Should read source files in sorted order and skip .git/node_modules."""
+        from let_claude_code.audit import read_target
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "b.py").write_text("print('b')")
+            (root / "a.go").write_text("package a")
+            (root / "notes.txt").write_text("ignored")
+            for skipped in (".git", "node_modules"):
+                (root / skipped).mkdir()
+                (root / skipped / "x.js").write_text("skipped")
+
+            content = read_target(root)
+
+        self.assertLess(content.index("=== a.go ==="), content.index("=== b.py ==="))
+        self.assertNotIn("skipped", content)
+        self.assertNotIn("ignored", content)
+
+    def test_read_source_files_in_parallel_keeps_walk_order(self):
+        """Should return the same ordered mapping when files are read on a pool."""
+        from let_claude_code.audit import PARALLEL_READ_MIN_FILES, read_source_files
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            names = [f"m{i:02}.py" for i in range(PARALLEL_READ_MIN_FILES + 4)]
+            for name in reversed(names):
+                (root / name).write_text(f"# {name}")
+
+            files = read_source_files(root)
+
+        self.assertEqual(list(files), names)
+        self.assertEqual(files["m03.py"], "# m03.py")
+
+    def test_read_source_files_rereads_only_modified(self):
+        """Should serve unchanged files from the stat-keyed cache."""
+        from let_claude_code.audit import read_source_files
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "a.py").write_text("a = 1")
+            (root / "b.py").write_text("b = 1")
+            read_source_files(root)
+
+            (root / "b.py").write_text("b = 22")
+            with patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as mock_read:
+                files = read_source_files(root)
+
+        self.assertEqual(files, {"a.py": "a = 1", "b.py": "b = 22"})
+        self.assertEqual([call.args[0].name for call in mock_read.call_args_list], ["b.py"])
+
+    @patch('builtins.print')
+    def test_format_sources_stops_at_payload_limit(self, mock_print):
+        """Should leave out files past the character budget and say how many."""
+        from let_claude_code.audit import format_sources
+
+        files = {"a.py": "a" * 40, "b.py": "b" * 40, "c.py": "c" * 40}
+
+        self.assertEqual(format_sources(files, max_chars=1000), format_sources(files))
+        payload = format_sources(files, max_chars=60)
+        self.assertIn("=== a.py ===", payload)
+        self.assertNotIn("=== b.py ===", payload)
+        self.assertTrue(payload.endswith("[2 more file(s) not included: payload limit of 60 characters reached]"))
+        self.assertEqual(format_sources({"big.py": "x" * 500}, max_chars=100),
+                         ("=== big.py ===\n" + "x" * 500)[:100] + "\n[big.py truncated at 100 chars]")
+        self.assertIn("big.py truncated", mock_print.call_args[0][0])
+
+    @patch('builtins.print')
+    def test_env_positive_int_falls_back_on_bad_value(self, mock_print):
+        """Should warn and use the default for a missing, non-numeric or non-positive setting."""
+        from let_claude_code.audit import env_positive_int
+
+        with patch.dict(os.environ, {"AUDIT_CONCURRENCY": "8"}):
+            self.assertEqual(env_positive_int("AUDIT_CONCURRENCY", 4), 8)
+        for bad in ("eight", "0", "-2"):
+            with patch.dict(os.environ, {"AUDIT_CONCURRENCY": bad}):
+                self.assertEqual(env_positive_int("AUDIT_CONCURRENCY", 4), 4)
+        self.assertEqual(mock_print.call_count, 3)
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(env_positive_int("AUDIT_CONCURRENCY", 4), 4)
+
+    def test_build_delta_payload(self):
+        """Should diff changed files, list unchanged ones, and return None when identical."""
+        from let_claude_code.audit import build_delta_payload
+
+        previous = {"a.py": "x = 1\n", "b.py": "y = 2\n"}
+        current = {"a.py": "x = 3\n", "b.py": "y = 2\n", "c.py": "z = 4\n"}
+
+        payload = build_delta_payload(previous, current)
+
+        self.assertIn("-x = 1", payload)
+        self.assertIn("+x = 3", payload)
+        self.assertIn("+++ b/c.py", payload)
+        self.assertIn("## Unchanged files\nb.py", payload)
+        self.assertIsNone(build_delta_payload(current, dict(current)))
+
+    @patch('builtins.print')
+    def test_build_delta_payload_respects_payload_limit(self, mock_print):
+        """A diff over AUDIT_MAX_CHARS should be cut at a line and marked as truncated."""
+        from let_claude_code.audit import build_delta_payload
+
+        previous = {"a.py": "".join(f"old {i}\n" for i in range(100))}
+        current = {"a.py": "".join(f"new {i}\n" for i in range(100))}
+
+        with patch.dict(os.environ, {"AUDIT_MAX_CHARS": "300"}):
+            payload = build_delta_payload(previous, current)
+
+        body, marker = payload.rsplit("\n", 1)
+        self.assertEqual(marker, "[diff truncated at 300 chars]")
+        self.assertLessEqual(len(body), 300)
+        self.assertIn(body.rsplit("\n", 1)[1], build_delta_payload(previous, current).split("\n"))
+        mock_print.assert_called_once()
+
+    def setUp(self):
+        from let_claude_code import audit
+        audit._openai_conn = None
+        audit._source_cache.clear()
+
+    def tearDown(self):
+        from let_claude_code import audit
+        audit._openai_conn = None
+        audit._source_cache.clear()
+
+    @patch('http.client.HTTPSConnection')
+    @patch('builtins.print')
+    def test_request_audit_stops_stream_on_no_verdict(self, mock_print, mock_conn_cls):
+        """Should return as soon as a NO verdict line has streamed in."""
+        from let_claude_code import audit
+        from let_claude_code.audit import request_audit
+
+        def event(text):
+            return b"data: " + json.dumps({"type": "response.output_text.delta", "delta": text}).encode() + b"\n"
+
+        consumed = []
+        lines = [event("ISSUES_FOUND: YES\n"), event("CONTINUE: NO"), event("\n"), event("INSTRUCTIONS...")]
+        response = MagicMock(status=200)
+        response.read1.side_effect = lambda size: consumed.append(lines[len(consumed)]) or consumed[-1]
+        response.isclosed.return_value = False
+        mock_conn_cls.return_value.getresponse.return_value = response
+
+        output = request_audit("prompt", "gpt-5.2", "high", "key")
+
+        self.assertEqual(output, "ISSUES_FOUND: YES\nCONTINUE: NO\n")
+        self.assertEqual(len(consumed), 3)
+        # The stream was abandoned mid-way, so the connection must not be reused
+        mock_conn_cls.return_value.close.assert_called()
+        self.assertIsNone(audit._openai_conn)
+
+    @patch('http.client.HTTPSConnection')
+    @patch('builtins.print')
+    def test_request_audit_assembles_sse_deltas(self, mock_print, mock_conn_cls):
+        """Should skip non-data SSE lines and join text deltas until [DONE]."""
+        from let_claude_code.audit import request_audit
+
+        def event(text):
+            return b"data: " + json.dumps({"type": "response.output_text.delta", "delta": text}).encode() + b"\n"
+
+        stream = b"".join([
+            b"event: response.output_text.delta\n", event("ISSUES_FOUND: YES\n"), b"\n",
+            b": keep-alive\n", event("CONTINUE: YES\n"), b"data: [DONE]\n", event("ignored"),
+        ])
+        # Split reads at arbitrary points, including mid-line
+        reads = [stream[i:i + 7] for i in range(0, len(stream), 7)] + [b""]
+        response = MagicMock(status=200)
+        response.read1.side_effect = reads
+        mock_conn_cls.return_value.getresponse.return_value = response
+
+        output = request_audit("prompt", "gpt-5.2", "high", "key")
+
+        self.assertEqual(output, "ISSUES_FOUND: YES\nCONTINUE: YES\n")
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_stream_echo_batches_writes(self, mock_stdout):
+        """Should hold small deltas until the size threshold or an explicit flush."""
+        from let_claude_code.audit import ECHO_FLUSH_CHARS, StreamEcho
+
+        echo = StreamEcho(flush_interval=60)
+        echo.write("ISSUES_")
+        echo.write("FOUND")
+        self.assertEqual(mock_stdout.getvalue(), "")
+
+        echo.write("x" * ECHO_FLUSH_CHARS)
+        self.assertEqual(mock_stdout.getvalue(), "ISSUES_FOUND" + "x" * ECHO_FLUSH_CHARS)
+
+        echo.write(": NO")
+        echo.flush()
+        self.assertTrue(mock_stdout.getvalue().endswith(": NO"))
+
+    def test_merge_audit_responses(self):
+        """Should report issues if any file has them and label instructions by file."""
+        from let_claude_code.audit import merge_audit_responses, parse_audit_response
+
+        merged = merge_audit_responses({
+            "a.py": "ISSUES_FOUND: YES\nCONTINUE: YES\nINSTRUCTIONS_FOR_CLAUDE:\nFix the loop",
+            "b.py": "ISSUES_FOUND: NO\nCONTINUE: NO\nINSTRUCTIONS_FOR_CLAUDE:\nN/A",
+        })
+
+        self.assertEqual(parse_audit_response(merged), (True, True, "### a.py\nFix the loop"))
+        self.assertEqual(parse_audit_response(merge_audit_responses({})), (False, False, None))
+
+    @patch('let_claude_code.audit.ask_gpt5')
+    @patch('builtins.print')
+    def test_audit_files_parallel_sends_one_request_per_file(self, mock_print, mock_ask):
+        """Should audit every file separately and drop failed requests."""
+        from let_claude_code.audit import audit_files_parallel
+
+        mock_ask.side_effect = lambda content, *args, **kwargs: None if "b.py" in content else content
+
+        responses = audit_files_parallel({"a.py": "x = 1", "b.py": "y = 2"}, "ctx", "gpt-5.2", None, "high",
+                                         max_workers=2)
+
+        self.assertEqual(list(responses), ["a.py"])
+        self.assertIn("x = 1", responses["a.py"])
+        self.assertEqual(mock_ask.call_count, 2)
+        self.assertTrue(all(call.kwargs["quiet"] for call in mock_ask.call_args_list))
+
+    def test_openai_post_does_not_resend_after_request_was_sent(self):
+        """A lost response must not trigger a second (paid) audit request."""
+        import http.client
+        from let_claude_code import audit
+
+        with patch('http.client.HTTPSConnection') as mock_conn_cls:
+            mock_conn_cls.return_value.getresponse.side_effect = http.client.RemoteDisconnected("closed")
+            with self.assertRaises(http.client.RemoteDisconnected):
+                with audit._openai_post("/v1/responses", b"{}", {}, 10):
+                    pass
+
+        mock_conn_cls.return_value.request.assert_called_once()
+
+    def test_openai_post_retries_unsent_request_on_fresh_connection(self):
+        """A reused connection that fails while writing should be replaced and the request resent."""
+        from let_claude_code import audit
+
+        stale = MagicMock()
+        stale.sock = None  # Checked before reuse; a closed socket means a new connection
+        audit._openai_conn = stale
+        with patch('http.client.HTTPSConnection') as mock_conn_cls:
+            with audit._openai_post("/v1/responses", b"{}", {}, 10):
+                pass
+        stale.request.assert_not_called()
+        mock_conn_cls.return_value.request.assert_called_once()
+
+        live = MagicMock()
+        live.request.side_effect = BrokenPipeError()
+        audit._openai_conn = live
+        with patch('let_claude_code.audit._server_closed', return_value=False), \
+                patch('http.client.HTTPSConnection') as mock_conn_cls:
+            with audit._openai_post("/v1/responses", b"{}", {}, 10):
+                pass
+        live.close.assert_called()
+        mock_conn_cls.return_value.request.assert_called_once()
+
+    def test_openai_post_closes_surplus_connection(self):
+        """Only one finished connection should be kept; extras from concurrent calls are closed."""
+        from let_claude_code import audit
+
+        pooled = MagicMock()
+        with patch('http.client.HTTPSConnection') as mock_conn_cls:
+            response = mock_conn_cls.return_value.getresponse.return_value
+            response.isclosed.return_value = True
+            response.will_close = False
+            with audit._openai_post("/v1/responses", b"{}", {}, 10):
+                audit._openai_conn = pooled  # Another request finished first
+
+        self.assertIs(audit._openai_conn, pooled)
+        mock_conn_cls.return_value.close.assert_called_once()
+
+    @patch('let_claude_code.audit.run_claude_with_instructions')
+    @patch('let_claude_code.audit.ask_gpt5')
+    @patch('builtins.print')
+    def test_main_stops_when_claude_changed_nothing(self, mock_print, mock_ask, mock_claude):
+        """Should not re-audit an unchanged tree on the next iteration."""
+        from let_claude_code.audit import main
+
+        mock_ask.return_value = "ISSUES_FOUND: YES\nCONTINUE: YES\nINSTRUCTIONS_FOR_CLAUDE:\nFix it"
+        mock_claude.return_value = (True, "No edits")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "a.py").write_text("x = 1")
+            with patch('sys.argv', ["audit", tmpdir, "--until-complete"]), \
+                    patch.dict(os.environ, {"OPENAI_API_KEY": "key"}), \
+                    self.assertRaises(SystemExit) as exit_info:
+                main()
+
+        self.assertEqual(exit_info.exception.code, 0)
+        mock_ask.assert_called_once()
+        mock_claude.assert_called_once()
+
+    @patch('let_claude_code.audit.run_claude_with_instructions')
+    @patch('let_claude_code.audit.ask_gpt5')
+    @patch('builtins.print')
+    def test_main_reaudits_full_code_after_failed_claude_run(self, mock_print, mock_ask, mock_claude):
+        """A failed Claude run that left the tree unchanged should get a full re-audit, not a stop."""
+        from let_claude_code.audit import main
+
+        mock_ask.return_value = "ISSUES_FOUND: YES\nCONTINUE: YES\nINSTRUCTIONS_FOR_CLAUDE:\nFix it"
+        mock_claude.return_value = (False, "Crashed")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "a.py").write_text("x = 1")
+            with patch('sys.argv', ["audit", tmpdir, "--until-complete", "--max-iterations", "2"]), \
+                    patch.dict(os.environ, {"OPENAI_API_KEY": "key"}), \
+                    self.assertRaises(SystemExit):
+                main()
+
+        self.assertEqual(mock_ask.call_count, 2)
+        self.assertIn("=== a.py ===\nx = 1", mock_ask.call_args[0][0])
+
+    def test_iter_response_lines_reassembles_split_reads(self):
+        """Should yield whole lines however the reads are split, plus any unterminated tail."""
+        from let_claude_code.audit import iter_response_lines
+
+        response = MagicMock()
+        response.read1.side_effect = [b"da", b"ta: 1\n\nda", b"ta: 2\nta", b"il", b""]
+
+        self.assertEqual(list(iter_response_lines(response)), [b"data: 1\n", b"\n", b"data: 2\n", b"tail"])
+
+    @patch('http.client.HTTPSConnection')
+    @patch('builtins.print')
+    def test_request_audit_quiet_prints_nothing(self, mock_print, mock_conn_cls):
+        """A quiet audit (one of several --parallel streams) should not print progress lines."""
+        from let_claude_code.audit import request_audit
+
+        events = [
+            {"type": "response.output_item.added", "item": {"type": "reasoning"}},
+            {"type": "response.output_text.delta", "delta": "ISSUES_FOUND: NO\n"},
+        ]
+        lines = [b"data: " + json.dumps(e).encode() + b"\n" for e in events] + [b""]
+        response = MagicMock(status=200)
+        response.read1.side_effect = lambda size: lines.pop(0)
+        mock_conn_cls.return_value.getresponse.return_value = response
+
+        self.assertEqual(request_audit("prompt", "gpt-5.2", "high", "key", quiet=True), "ISSUES_FOUND: NO\n")
+        mock_print.assert_not_called()
+
+    @patch('let_claude_code.audit._server_closed', return_value=False)
+    @patch('http.client.HTTPSConnection')
+    @patch('builtins.print')
+    def test_request_audit_reuses_connection(self, mock_print, mock_conn_cls, mock_closed):
+        """Fully read responses should leave the connection open for the next call."""
+        from let_claude_code.audit import request_audit
+
+        body = json.dumps({"choices": [{"message": {"content": "ISSUES_FOUND: NO"}}]}).encode()
+        response = MagicMock(status=200, will_close=False)
+        response.read.return_value = body
+        response.isclosed.return_value = True
+        mock_conn_cls.return_value.getresponse.return_value = response
+
+        self.assertEqual(request_audit("prompt", "gpt-4o", "high", "key"), "ISSUES_FOUND: NO")
+        self.assertEqual(request_audit("prompt", "gpt-4o", "high", "key"), "ISSUES_FOUND: NO")
+
+        mock_conn_cls.assert_called_once()
+        self.assertEqual(mock_conn_cls.return_value.request.call_count, 2)
+
+    @patch('subprocess.Popen')
+    @patch('builtins.print')
+    def test_run_claude_with_instructions_pipes_stdin(self, mock_print, mock_popen):
+        """Should run claude directly and send the instructions on stdin."""
+        from let_claude_code.audit import run_claude_with_instructions
+
+        process = mock_popen.return_value
+        process.stdout = iter(["fixed\n"])
+        process.returncode = 0
+
+        success, summary = run_claude_with_instructions("Fix it", Path("."))
+
+        self.assertTrue(success)
+        self.assertEqual(summary, "fixed\n")
+        self.assertEqual(mock_popen.call_args[0][0], ["claude", "--print"])
+        self.assertIsNone(mock_popen.call_args.kwargs.get("stderr"))  # Inherited, not merged into stdout
+        process.stdin.write.assert_called_once_with("Fix it")
+
+    @patch('subprocess.Popen')
+    @patch('builtins.print')
+    def test_run_claude_with_instructions_keeps_tail(self, mock_print, mock_popen):
+        """Should keep only the last SUMMARY_TAIL_LINES lines as the summary."""
+        from let_claude_code.audit import SUMMARY_TAIL_LINES, run_claude_with_instructions
+
+        process = mock_popen.return_value
+        process.stdout = iter([f"{i}\n" for i in range(SUMMARY_TAIL_LINES + 50)])
+        process.returncode = 1
+
+        success, summary = run_claude_with_instructions("Fix it", Path("."))
+
+        self.assertFalse(success)
+        self.assertEqual(summary.splitlines(), [str(i) for i in range(50, SUMMARY_TAIL_LINES + 50)])
+
+    def test_parse_audit_response(self):
+        """Should read both verdicts and the instructions block."""
+        from let_claude_code.audit import parse_audit_response
+
+        response = (
+            "ISSUES_FOUND: YES\nCONTINUE: YES\n\nINSTRUCTIONS_FOR_CLAUDE:\n"
+            "1. Add error handling to load()\n\n2. Fix the off-by-one in parse()\n"
+        )
+        self.assertEqual(parse_audit_response(response), (
+            True, True, "1. Add error handling to load()\n2. Fix the off-by-one in parse()",
+        ))
+        self.assertEqual(
+            parse_audit_response("ISSUES_FOUND: NO\nCONTINUE: NO\nINSTRUCTIONS_FOR_CLAUDE: N/A"),
+            (False, False, None),
+        )
+
+    @patch('let_claude_code.audit.request_audit', return_value="ISSUES_FOUND: NO")
+    def test_ask_gpt5_reuses_cached_response(self, mock_request):
+        """Identical requests should be answered from the disk cache."""
+        from let_claude_code import audit
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch.object(audit, "CACHE_DIR", Path(tmpdir)), \
+                patch.dict(os.environ, {"OPENAI_API_KEY": "key"}):
+            first = audit.ask_gpt5("code", "ctx")
+            second = audit.ask_gpt5("code", "ctx")
+            audit.ask_gpt5("code", "ctx", use_cache=False)
+            audit.ask_gpt5("changed code", "ctx")
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_request.call_count, 3)
+
+
 if __name__ == "__main__":
     unittest.main()